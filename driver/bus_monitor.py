@@ -0,0 +1,208 @@
+# 屏幕驱动的总线流量统计，适用于 ST7735 / ST7789 / SSD1306 / SH1106 的 spi 和 buf 驱动
+# Github: https://github.com/funnygeeker/micropython-easydisplay
+# Author: funnygeeker
+# Licence: MIT
+#
+# 用法:
+#   mon = BusMonitor(dp)  # 替换屏幕实例的总线和引脚，未创建时驱动不受任何影响
+#   em.show()
+#   print(mon.snapshot())
+#   mon.reset()
+#   mon.detach()  # 恢复原来的总线和引脚
+try:
+    from time import ticks_us, ticks_diff
+except ImportError:  # CPython
+    from time import perf_counter
+
+    def ticks_us():
+        return int(perf_counter() * 1000000)
+
+    def ticks_diff(a, b):
+        return a - b
+
+
+class _Pin:
+    def __init__(self, pin, monitor, cs: bool):
+        """
+        记录电平变化的引脚代理
+
+        Args:
+            pin: 被代理的引脚
+            monitor: BusMonitor 实例
+            cs: 是否为片选引脚
+        """
+        self._pin = pin
+        self._monitor = monitor
+        self._cs = cs
+        self.level = None
+
+    def __call__(self, value=None):
+        if value is None:
+            return self._pin()
+        if value != self.level:
+            self.level = value
+            if self._cs:
+                self._monitor.cs_toggles += 1
+        self._pin(value)
+
+    def __getattr__(self, name):
+        return getattr(self._pin, name)
+
+
+class _SPI:
+    def __init__(self, spi, monitor):
+        """
+        记录写入的 SPI 代理，根据 DC 引脚的电平区分命令和数据
+
+        Args:
+            spi: 被代理的 SPI
+            monitor: BusMonitor 实例
+        """
+        self._spi = spi
+        self._monitor = monitor
+
+    def write(self, buf):
+        m = self._monitor
+        size = len(memoryview(buf))  # 原生 FrameBuffer 不支持 len()
+        m.transactions += 1
+        if m.dc is not None and m.dc.level == 0:
+            m.commands += 1
+            m.cmd_bytes += size
+        else:
+            m.data_bytes += size
+        self._spi.write(buf)
+
+    def __getattr__(self, name):
+        return getattr(self._spi, name)
+
+
+class _I2C:
+    def __init__(self, i2c, monitor):
+        """
+        记录写入的 I2C 代理，根据控制字节区分命令和数据
+
+        Args:
+            i2c: 被代理的 I2C
+            monitor: BusMonitor 实例
+        """
+        self._i2c = i2c
+        self._monitor = monitor
+
+    def _count(self, control, size):
+        m = self._monitor
+        m.transactions += 1
+        if control & 0x40:  # D/C# = 1
+            m.data_bytes += size
+        else:
+            m.commands += 1
+            m.cmd_bytes += size
+
+    def writeto(self, addr, buf, stop=True):
+        buf = memoryview(buf)
+        self._count(buf[0], len(buf) - 1)  # 不计算控制字节
+        return self._i2c.writeto(addr, buf, stop)
+
+    def writevto(self, addr, vector, stop=True):
+        size = 0
+        for buf in vector:
+            size += len(memoryview(buf))
+        self._count(memoryview(vector[0])[0], size - 1)
+        return self._i2c.writevto(addr, vector, stop)
+
+    def __getattr__(self, name):
+        return getattr(self._i2c, name)
+
+
+class BusMonitor:
+    def __init__(self, display):
+        """
+        统计屏幕驱动的总线流量：命令数量，命令和数据的字节数，CS 电平变化次数，show() 和 set_window() 的调用次数与耗时
+
+        Args:
+            display: 屏幕驱动实例
+        """
+        self.display = display
+        self.dc = None
+        self._saved = []  # [(属性名, 原来的值), ...]
+        self.reset()
+        self.attach()
+
+    def reset(self):
+        """
+        清零所有统计数据
+        """
+        self.commands = 0  # 命令数量
+        self.cmd_bytes = 0  # 命令字节数
+        self.data_bytes = 0  # 数据字节数
+        self.transactions = 0  # 总线写入次数
+        self.cs_toggles = 0  # CS 电平变化次数
+        self.show_calls = 0
+        self.show_us = 0
+        self.window_calls = 0
+        self.window_us = 0
+
+    def snapshot(self) -> dict:
+        """
+        返回当前的统计数据
+
+        Returns:
+            dict
+        """
+        return {'commands': self.commands, 'cmd_bytes': self.cmd_bytes, 'data_bytes': self.data_bytes,
+                'transactions': self.transactions, 'cs_toggles': self.cs_toggles,
+                'show_calls': self.show_calls, 'show_us': self.show_us,
+                'window_calls': self.window_calls, 'window_us': self.window_us}
+
+    def _replace(self, name, value):
+        self._saved.append((name, self.display.__dict__.get(name, self)))
+        setattr(self.display, name, value)
+
+    def _timed(self, func, name):
+        def wrapper(*args, **kwargs):
+            start = ticks_us()
+            result = func(*args, **kwargs)
+            us = ticks_diff(ticks_us(), start)
+            if name == 'show':
+                self.show_calls += 1
+                self.show_us += us
+            else:
+                self.window_calls += 1
+                self.window_us += us
+            return result
+
+        return wrapper
+
+    def attach(self):
+        """
+        替换屏幕实例的总线，引脚和方法，开始统计
+        """
+        if self._saved:
+            return
+        dp = self.display
+        dc = getattr(dp, 'dc', None)
+        if callable(dc):
+            self.dc = _Pin(dc, self, False)
+            self._replace('dc', self.dc)
+        cs = getattr(dp, 'cs', None)
+        if callable(cs) and cs is not int:  # 未使用 CS 引脚时为 int
+            self._replace('cs', _Pin(cs, self, True))
+        if getattr(dp, 'spi', None) is not None:
+            self._replace('spi', _SPI(dp.spi, self))
+        if getattr(dp, 'i2c', None) is not None:
+            self._replace('i2c', _I2C(dp.i2c, self))
+        self._replace('show', self._timed(dp.show, 'show'))
+        if hasattr(dp, 'set_window'):
+            self._replace('set_window', self._timed(dp.set_window, 'set_window'))
+
+    def detach(self):
+        """
+        恢复屏幕实例原来的总线，引脚和方法，停止统计
+        """
+        dp = self.display
+        while self._saved:
+            name, value = self._saved.pop()
+            if value is self:  # 原来是类中的方法
+                delattr(dp, name)
+            else:
+                setattr(dp, name, value)
+        self.dc = None
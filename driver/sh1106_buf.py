@@ -26,9 +26,13 @@ class SH1106(framebuf.FrameBuffer):
         self.bufsize = self.pages * self.width
         self.buffer = bytearray(self.bufsize)
         self.pages_to_update = 0
+        # column range to update for every page
+        self.columns_start = [self.width] * self.pages
+        self.columns_end = [-1] * self.pages
 
         if self.rotate90:
             self.displaybuf = bytearray(self.bufsize)
+            self.step_slice = True  # cleared when bytearray slices with a step are not supported
             # HMSB is required to keep the bit order in the render buffer
             # compatible with byte-for-byte remapping to the display buffer,
             # which is in VLSB. Else we'd have to copy bit-by-bit!
@@ -122,68 +126,118 @@ class SH1106(framebuf.FrameBuffer):
 
     def show(self, full_update=False):
         # self.* lookups in loops take significant time (~4fps).
-        (w, p, db, rb) = (self.width, self.pages,
-                          self.displaybuf, self.buffer)
-        if self.rotate90:
-            for i in range(self.bufsize):
-                db[w * (i % p) + (i // p)] = rb[i]
+        (w, db) = (self.width, self.displaybuf)
         if full_update:
             pages_to_update = (1 << self.pages) - 1
         else:
             pages_to_update = self.pages_to_update
+        (columns_start, columns_end) = (self.columns_start, self.columns_end)
         # print("Updating pages: {:08b}".format(pages_to_update))
         for page in range(self.pages):
             if (pages_to_update & (1 << page)):
+                (start, end) = (columns_start[page], columns_end[page])
+                if full_update or start > end:
+                    # pages marked through pages_to_update alone are sent whole
+                    (start, end) = (0, w - 1)
+                if self.rotate90:
+                    self._remap(page, start, end)
+                column = start + 2  # the SH1106 RAM is 132 columns wide, the panel starts at column 2
                 self.write_cmd(_SET_PAGE_ADDRESS | page)
-                self.write_cmd(_LOW_COLUMN_ADDRESS | 2)
-                self.write_cmd(_HIGH_COLUMN_ADDRESS | 0)
-                self.write_data(db[(w * page):(w * page + w)])
+                self.write_cmd(_LOW_COLUMN_ADDRESS | (column & 0x0F))
+                self.write_cmd(_HIGH_COLUMN_ADDRESS | (column >> 4))
+                self.write_data(db[(w * page + start):(w * page + end + 1)])
+            columns_start[page] = w
+            columns_end[page] = -1
         self.pages_to_update = 0
 
+    def _remap(self, page, start, end):
+        # copy columns start..end of a page from the rotated render buffer to the display buffer:
+        # display byte (page, column) is render byte column * pages + page
+        (w, p, db, rb) = (self.width, self.pages,
+                          self.displaybuf, self.buffer)
+        dst = w * page + start
+        src = start * p + page
+        if self.step_slice:
+            try:
+                db[dst:dst + end - start + 1] = rb[src:end * p + page + 1:p]
+                return
+            except NotImplementedError:
+                # MicroPython only supports slices with step=1
+                self.step_slice = False
+        for dst in range(dst, dst + end - start + 1):
+            db[dst] = rb[src]
+            src += p
+
     def pixel(self, x, y, color=None):
         if color is None:
             return super().pixel(x, y)
         else:
             super().pixel(x, y, color)
-            page = y // 8
-            self.pages_to_update |= 1 << page
+            self.register_updates(y, y, x, x)
 
     def text(self, text, x, y, color=1):
         super().text(text, x, y, color)
-        self.register_updates(y, y + 7)
+        self.register_updates(y, y + 7, x, x + len(text) * 8 - 1)
 
     def line(self, x0, y0, x1, y1, color):
         super().line(x0, y0, x1, y1, color)
-        self.register_updates(y0, y1)
+        self.register_updates(y0, y1, x0, x1)
 
     def hline(self, x, y, w, color):
         super().hline(x, y, w, color)
-        self.register_updates(y)
+        self.register_updates(y, y, x, x + w - 1)
 
     def vline(self, x, y, h, color):
         super().vline(x, y, h, color)
-        self.register_updates(y, y + h - 1)
+        self.register_updates(y, y + h - 1, x, x)
 
     def fill(self, color):
         super().fill(color)
-        self.pages_to_update = (1 << self.pages) - 1
+        self.register_updates(0, self.width + self.height)
 
     def blit(self, fbuf, x, y, key=-1, palette=None):
         super().blit(fbuf, x, y, key, palette)
-        self.register_updates(y, y + self.height)
+        # a native FrameBuffer has no width / height attribute, mark up to the screen edge then
+        edge = self.width + self.height
+        self.register_updates(y, y + getattr(fbuf, 'height', edge) - 1,
+                              x, x + getattr(fbuf, 'width', edge) - 1)
 
     def scroll(self, x, y):
         # my understanding is that scroll() does a full screen change
         super().scroll(x, y)
-        self.pages_to_update = (1 << self.pages) - 1
+        self.register_updates(0, self.width + self.height)
 
     def fill_rect(self, x, y, w, h, color):
         super().fill_rect(x, y, w, h, color)
-        self.register_updates(y, y + h - 1)
-
-    def rect(self, x, y, w, h, color):
-        super().rect(x, y, w, h, color)
-        self.register_updates(y, y + h - 1)
+        self.register_updates(y, y + h - 1, x, x + w - 1)
+
+    def rect(self, x, y, w, h, color, *args):
+        super().rect(x, y, w, h, color, *args)
+        self.register_updates(y, y + h - 1, x, x + w - 1)
+
+    def ellipse(self, x, y, xr, yr, color, *args):
+        super().ellipse(x, y, xr, yr, color, *args)
+        self.register_updates(y - yr, y + yr, x - xr, x + xr)
+
+    def poly(self, x, y, coords, color, *args):
+        super().poly(x, y, coords, color, *args)
+        n = len(coords)
+        if n > 1:
+            # MicroPython 的 array 不支持步长切片，逐个坐标查找边界
+            x0 = x1 = coords[0]
+            y0 = y1 = coords[1]
+            for i in range(2, n - 1, 2):
+                v = coords[i]
+                if v < x0:
+                    x0 = v
+                elif v > x1:
+                    x1 = v
+                v = coords[i + 1]
+                if v < y0:
+                    y0 = v
+                elif v > y1:
+                    y1 = v
+            self.register_updates(y + y0, y + y1, x + x0, x + x1)
 
     def circle(self, x, y, radius, c, section=100):
         """
@@ -224,17 +278,34 @@ class SH1106(framebuf.FrameBuffer):
             self.vline(x + _x, y0, length, c)  # 绘制左右两侧的垂直线
             self.vline(x - _x, y0, length, c)
 
-    def register_updates(self, y0, y1=None):
-        # this function takes the top and optional bottom address of the changes made
-        # and updates the pages_to_change list with any changed pages
-        # that are not yet on the list
+    def register_updates(self, y0, y1=None, x0=0, x1=None):
+        # this function takes the top and optional bottom address of the changes made,
+        # plus the optional left and right address (the whole row by default),
+        # and updates the pages_to_change list and the column range of those pages
+        if y1 is None:
+            y1 = y0
+        elif y0 > y1:
+            y0, y1 = y1, y0
+        if x1 is None:
+            x1 = self.width + self.height
+        elif x0 > x1:
+            x0, x1 = x1, x0
+        if self.rotate90:
+            # the render buffer is transposed: x selects the page, y the column
+            (y0, y1, x0, x1) = (x0, x1, y0, y1)
         start_page = max(0, y0 // 8)
-        end_page = max(0, y1 // 8) if y1 is not None else start_page
-        # rearrange start_page and end_page if coordinates were given from bottom to top
-        if start_page > end_page:
-            start_page, end_page = end_page, start_page
+        end_page = min(self.pages - 1, y1 // 8)
+        x0 = max(0, x0)
+        x1 = min(self.width - 1, x1)
+        if x0 > x1:
+            return
+        (columns_start, columns_end) = (self.columns_start, self.columns_end)
         for page in range(start_page, end_page + 1):
             self.pages_to_update |= 1 << page
+            if x0 < columns_start[page]:
+                columns_start[page] = x0
+            if x1 > columns_end[page]:
+                columns_end[page] = x1
 
     def reset(self, res):
         if res is not None:
@@ -34,6 +34,10 @@ class SSD1306(framebuf.FrameBuffer):
         self.external_vcc = external_vcc
         self.pages = self.height // 8
         self.buffer = bytearray(self.pages * self.width)
+        self.pages_to_update = 0
+        # column range to update for every page
+        self.columns_start = [self.width] * self.pages
+        self.columns_end = [-1] * self.pages
         super().__init__(self.buffer, self.width, self.height, framebuf.MONO_VLSB)
         self.init_display()
         self.rotate(rotate)
@@ -106,7 +110,7 @@ class SSD1306(framebuf.FrameBuffer):
             mir_v = True
         self.write_cmd(SET_SEG_REMAP | (0x01 if mir_v else 0x00))
         self.write_cmd(SET_COM_OUT_DIR | (0x08 if mir_h else 0x00))
-        self.show()
+        self.show(True)  # 方向只影响之后写入的数据，需要重新发送整个屏幕
 
     def invert(self, invert):
         """
@@ -114,20 +118,134 @@ class SSD1306(framebuf.FrameBuffer):
         """
         self.write_cmd(SET_NORM_INV | (invert & 1))
 
-    def show(self):
-        x0 = 0
-        x1 = self.width - 1
-        if self.width == 64:
-            # displays with width of 64 pixels are shifted by 32
-            x0 += 32
-            x1 += 32
-        self.write_cmd(SET_COL_ADDR)
-        self.write_cmd(x0)
-        self.write_cmd(x1)
-        self.write_cmd(SET_PAGE_ADDR)
-        self.write_cmd(0)
-        self.write_cmd(self.pages - 1)
-        self.write_data(self.buffer)
+    def show(self, full_update=False):
+        (w, buf) = (self.width, self.buffer)
+        if full_update:
+            self.register_updates(0, self.height - 1)
+        (pages_to_update, columns_start, columns_end) = (self.pages_to_update, self.columns_start, self.columns_end)
+        page = 0
+        while page < self.pages:
+            if not (pages_to_update & (1 << page)):
+                page += 1
+                continue
+            # consecutive dirty pages share one window covering their column ranges
+            (start_page, x0, x1) = (page, w, -1)
+            while page < self.pages and pages_to_update & (1 << page):
+                (start, end) = (columns_start[page], columns_end[page])
+                if start > end:  # pages marked through pages_to_update alone are sent whole
+                    (start, end) = (0, w - 1)
+                (x0, x1) = (min(x0, start), max(x1, end))
+                columns_start[page] = w
+                columns_end[page] = -1
+                page += 1
+            offset = 32 if w == 64 else 0  # displays with width of 64 pixels are shifted by 32
+            self.write_cmd(SET_COL_ADDR)
+            self.write_cmd(x0 + offset)
+            self.write_cmd(x1 + offset)
+            self.write_cmd(SET_PAGE_ADDR)
+            self.write_cmd(start_page)
+            self.write_cmd(page - 1)
+            if x0 == 0 and x1 == w - 1:  # whole pages are contiguous in the buffer
+                self.write_data(buf[w * start_page:w * page])
+            else:
+                for p in range(start_page, page):
+                    self.write_data(buf[w * p + x0:w * p + x1 + 1])
+        self.pages_to_update = 0
+
+    def register_updates(self, y0, y1=None, x0=0, x1=None):
+        # this function takes the top and optional bottom address of the changes made,
+        # plus the optional left and right address (the whole row by default),
+        # and updates the pages_to_update mask and the column range of those pages
+        if y1 is None:
+            y1 = y0
+        elif y0 > y1:
+            y0, y1 = y1, y0
+        if x1 is None:
+            x1 = self.width - 1
+        elif x0 > x1:
+            x0, x1 = x1, x0
+        start_page = max(0, y0 // 8)
+        end_page = min(self.pages - 1, y1 // 8)
+        x0 = max(0, x0)
+        x1 = min(self.width - 1, x1)
+        if x0 > x1:
+            return
+        (columns_start, columns_end) = (self.columns_start, self.columns_end)
+        for page in range(start_page, end_page + 1):
+            self.pages_to_update |= 1 << page
+            if x0 < columns_start[page]:
+                columns_start[page] = x0
+            if x1 > columns_end[page]:
+                columns_end[page] = x1
+
+    def pixel(self, x, y, color=None):
+        if color is None:
+            return super().pixel(x, y)
+        else:
+            super().pixel(x, y, color)
+            self.register_updates(y, y, x, x)
+
+    def text(self, text, x, y, color=1):
+        super().text(text, x, y, color)
+        self.register_updates(y, y + 7, x, x + len(text) * 8 - 1)
+
+    def line(self, x0, y0, x1, y1, color):
+        super().line(x0, y0, x1, y1, color)
+        self.register_updates(y0, y1, x0, x1)
+
+    def hline(self, x, y, w, color):
+        super().hline(x, y, w, color)
+        self.register_updates(y, y, x, x + w - 1)
+
+    def vline(self, x, y, h, color):
+        super().vline(x, y, h, color)
+        self.register_updates(y, y + h - 1, x, x)
+
+    def fill(self, color):
+        super().fill(color)
+        self.register_updates(0, self.height - 1)
+
+    def blit(self, fbuf, x, y, key=-1, palette=None):
+        super().blit(fbuf, x, y, key, palette)
+        # a native FrameBuffer has no width / height attribute, mark up to the screen edge then
+        self.register_updates(y, y + getattr(fbuf, 'height', self.height) - 1,
+                              x, x + getattr(fbuf, 'width', self.width) - 1)
+
+    def scroll(self, x, y):
+        super().scroll(x, y)
+        self.register_updates(0, self.height - 1)
+
+    def fill_rect(self, x, y, w, h, color):
+        super().fill_rect(x, y, w, h, color)
+        self.register_updates(y, y + h - 1, x, x + w - 1)
+
+    def rect(self, x, y, w, h, color, *args):
+        super().rect(x, y, w, h, color, *args)
+        self.register_updates(y, y + h - 1, x, x + w - 1)
+
+    def ellipse(self, x, y, xr, yr, color, *args):
+        super().ellipse(x, y, xr, yr, color, *args)
+        self.register_updates(y - yr, y + yr, x - xr, x + xr)
+
+    def poly(self, x, y, coords, color, *args):
+        super().poly(x, y, coords, color, *args)
+        n = len(coords)
+        if n > 1:
+            # MicroPython 的 array 不支持步长切片，逐个坐标查找边界
+            x0 = x1 = coords[0]
+            y0 = y1 = coords[1]
+            for i in range(2, n - 1, 2):
+                v = coords[i]
+                if v < x0:
+                    x0 = v
+                elif v > x1:
+                    x1 = v
+                v = coords[i + 1]
+                if v < y0:
+                    y0 = v
+                elif v > y1:
+                    y1 = v
+            self.register_updates(y + y0, y + y1, x + x0, x + x1)
 
     def back_light(self, value):
         """
@@ -58,6 +58,7 @@ WHITE = const(0xFFFF)
 
 _ENCODE_PIXEL = ">H"
 _ENCODE_POS = ">HH"
+_MAX_DIRTY = const(8)  # 脏区域数量上限，超出时合并为一个区域
 _DECODE_PIXEL = ">BBB"
 
 _BUFFER_SIZE = const(256)
@@ -115,7 +116,8 @@ def _encode_pixel(c):
 
 class ST7735(framebuf.FrameBuffer):
     def __init__(self, width: int, height: int, spi, res: int, dc: int,
-                 cs: int = None, bl: int = None, rotate: int = 0, rgb: bool = True, invert: bool = True):
+                 cs: int = None, bl: int = None, rotate: int = 0, rgb: bool = True, invert: bool = True,
+                 flush_threshold: float = 0.5):
         """
         初始化屏幕驱动
 
@@ -130,6 +132,7 @@ class ST7735(framebuf.FrameBuffer):
             rotate: 旋转图像，数值为 0-6
             rgb: 使用 RGB 颜色模式，而不是 BGR
             invert: 反转颜色
+            flush_threshold: 待刷新区域占屏幕面积的比例超过该值时，刷新整个屏幕
         """
         self.width = width
         self.height = height
@@ -149,6 +152,8 @@ class ST7735(framebuf.FrameBuffer):
             self.bl = None
         self._rotate = rotate
         self._rgb = rgb
+        self.flush_threshold = flush_threshold
+        self.dirty = []  # 待刷新的区域 [x0, y0, x1, y1]
         self.hard_reset()
         self.soft_reset()
         self.poweron()
@@ -292,6 +297,7 @@ class ST7735(framebuf.FrameBuffer):
 
         self.width, self.height, self.x_start, self.y_start = table[rotate]
         super().__init__(self.buffer, self.width, self.height, framebuf.RGB565, self.width)
+        self.register_updates(0, self.height - 1)  # 旋转后需要刷新整个屏幕
         self._write(MADCTL, bytes([madctl | (0x00 if self._rgb else 0x08)]))
 
     def _set_columns(self, start, end):
@@ -339,12 +345,172 @@ class ST7735(framebuf.FrameBuffer):
         """
         self.fill(0)
 
-    def show(self):
+    def show(self, full_update: bool = False):
         """
-        将帧缓冲区数据发送到屏幕
+        将帧缓冲区中发生变化的区域发送到屏幕
+
+        Args:
+            full_update: 刷新整个屏幕
+        """
+        dirty = self.dirty
+        if not (dirty or full_update):
+            return
+        area = 0
+        for r in dirty:
+            area += (r[2] - r[0] + 1) * (r[3] - r[1] + 1)
+        if full_update or area > self.flush_threshold * self.width * self.height:
+            self.set_window(0, 0, self.width - 1, self.height - 1)
+            self._write(RAMWR, self.buffer)
+        else:
+            for r in dirty:  # 每个区域使用一个窗口发送
+                self.show_rect(r[0], r[1], r[2] - r[0] + 1, r[3] - r[1] + 1)
+        self.dirty = []
+
+    def show_rect(self, x, y, w, h):
+        """
+        将帧缓冲区中的指定区域发送到屏幕
+
+        Args:
+            x: 区域左上角 x 坐标
+            y: 区域左上角 y 坐标
+            w: 区域宽度
+            h: 区域高度
+        """
+        x0 = max(x, 0)
+        y0 = max(y, 0)
+        x1 = min(x + w, self.width) - 1
+        y1 = min(y + h, self.height) - 1
+        if x0 > x1 or y0 > y1:
+            return
+        self.set_window(x0, y0, x1, y1)
+        buf = memoryview(self.buffer)
+        stride = self.width * 2
+        self.cs(0)
+        self.dc(1)
+        if x0 == 0 and x1 == self.width - 1:  # 整行区域在缓冲区中是连续的
+            self.spi.write(buf[y0 * stride:(y1 + 1) * stride])
+        else:
+            length = (x1 - x0 + 1) * 2
+            for start in range(y0 * stride + x0 * 2, (y1 + 1) * stride, stride):
+                self.spi.write(buf[start:start + length])
+        self.cs(1)
+        # 已发送的区域不需要再次刷新
+        self.dirty = [r for r in self.dirty if not (x0 <= r[0] and y0 <= r[1] and r[2] <= x1 and r[3] <= y1)]
+
+    def register_updates(self, y0, y1=None, x0=0, x1=None):
         """
-        self.set_window(0, 0, self.width - 1, self.height - 1)
-        self._write(RAMWR, self.buffer)
+        标记需要刷新的区域
+
+        Args:
+            y0: 起始行
+            y1: 结束行（包含），默认与起始行相同
+            x0: 起始列
+            x1: 结束列（包含），默认为最后一列
+        """
+        if y1 is None:
+            y1 = y0
+        elif y0 > y1:
+            y0, y1 = y1, y0
+        if x1 is None:
+            x1 = self.width - 1
+        elif x0 > x1:
+            x0, x1 = x1, x0
+        # 限制在屏幕范围内
+        x0 = max(x0, 0)
+        y0 = max(y0, 0)
+        x1 = min(x1, self.width - 1)
+        y1 = min(y1, self.height - 1)
+        if x0 > x1 or y0 > y1:
+            return
+        dirty = self.dirty
+        for r in dirty:
+            if r[0] <= x0 and r[1] <= y0 and x1 <= r[2] and y1 <= r[3]:  # 已包含在待刷新的区域中
+                return
+        # 与相交或相邻的区域合并
+        i = 0
+        while i < len(dirty):
+            r = dirty[i]
+            if x0 <= r[2] + 1 and r[0] <= x1 + 1 and y0 <= r[3] + 1 and r[1] <= y1 + 1:
+                x0 = min(x0, r[0])
+                y0 = min(y0, r[1])
+                x1 = max(x1, r[2])
+                y1 = max(y1, r[3])
+                dirty.pop(i)
+                i = 0
+            else:
+                i += 1
+        dirty.append([x0, y0, x1, y1])
+        if len(dirty) > _MAX_DIRTY:  # 区域过多时合并为一个区域
+            self.dirty = [[min(r[0] for r in dirty), min(r[1] for r in dirty),
+                           max(r[2] for r in dirty), max(r[3] for r in dirty)]]
+
+    def pixel(self, x, y, c=None):
+        if c is None:
+            return super().pixel(x, y)
+        super().pixel(x, y, c)
+        self.register_updates(y, y, x, x)
+
+    def fill(self, c):
+        super().fill(c)
+        self.register_updates(0, self.height - 1)
+
+    def fill_rect(self, x, y, w, h, c):
+        super().fill_rect(x, y, w, h, c)
+        self.register_updates(y, y + h - 1, x, x + w - 1)
+
+    def hline(self, x, y, w, c):
+        super().hline(x, y, w, c)
+        self.register_updates(y, y, x, x + w - 1)
+
+    def vline(self, x, y, h, c):
+        super().vline(x, y, h, c)
+        self.register_updates(y, y + h - 1, x, x)
+
+    def line(self, x0, y0, x1, y1, c):
+        super().line(x0, y0, x1, y1, c)
+        self.register_updates(y0, y1, x0, x1)
+
+    def rect(self, x, y, w, h, c, *args):
+        super().rect(x, y, w, h, c, *args)
+        self.register_updates(y, y + h - 1, x, x + w - 1)
+
+    def ellipse(self, x, y, xr, yr, c, *args):
+        super().ellipse(x, y, xr, yr, c, *args)
+        self.register_updates(y - yr, y + yr, x - xr, x + xr)
+
+    def poly(self, x, y, coords, c, *args):
+        super().poly(x, y, coords, c, *args)
+        n = len(coords)
+        if n > 1:
+            # MicroPython 的 array 不支持步长切片，逐个坐标查找边界
+            x0 = x1 = coords[0]
+            y0 = y1 = coords[1]
+            for i in range(2, n - 1, 2):
+                v = coords[i]
+                if v < x0:
+                    x0 = v
+                elif v > x1:
+                    x1 = v
+                v = coords[i + 1]
+                if v < y0:
+                    y0 = v
+                elif v > y1:
+                    y1 = v
+            self.register_updates(y + y0, y + y1, x + x0, x + x1)
+
+    def text(self, s, x, y, c=1):
+        super().text(s, x, y, c)
+        self.register_updates(y, y + 7, x, x + len(s) * 8 - 1)
+
+    def blit(self, fbuf, x, y, key=-1, palette=None):
+        super().blit(fbuf, x, y, key, palette)
+        # 原生 FrameBuffer 没有 width / height 属性，此时标记到屏幕边缘
+        self.register_updates(y, y + getattr(fbuf, 'height', self.height) - 1,
+                              x, x + getattr(fbuf, 'width', self.width) - 1)
+
+    def scroll(self, xstep, ystep):
+        super().scroll(xstep, ystep)
+        self.register_updates(0, self.height - 1)
 
     # @staticmethod
     # def color(r, g, b):
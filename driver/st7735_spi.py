@@ -59,6 +59,8 @@ _ENCODE_POS = ">HH"
 _DECODE_PIXEL = ">BBB"
 
 _BUFFER_SIZE = const(256)
+_MAX_FILL_CHUNK = const(4092)  # 单次 DMA 传输的最大字节数
+_FILL_PATTERNS = const(4)  # 缓存的填充颜色数量
 
 GMCTRP1 = const(0xE0)
 GMCTRN1 = const(0xE1)
@@ -113,7 +115,8 @@ def _encode_pixel(c):
 
 class ST7735:
     def __init__(self, width: int, height: int, spi, res: int, dc: int,
-                 cs: int = None, bl: int = None, rotate: int = 0, rgb: bool = True, invert: bool = True):
+                 cs: int = None, bl: int = None, rotate: int = 0, rgb: bool = True, invert: bool = True,
+                 fill_chunk: int = _BUFFER_SIZE * 2):
         """
         初始化屏幕驱动
 
@@ -128,6 +131,7 @@ class ST7735:
             rotate: 旋转图像，数值为 0-6
             rgb: 使用 RGB 颜色模式，而不是 BGR
             invert: 反转颜色
+            fill_chunk: 填充矩形时每次发送的字节数，范围为 2 ~ 4092
         """
         self.width = width
         self.height = height
@@ -147,6 +151,11 @@ class ST7735:
             self.bl = None
         self._rotate = rotate
         self._rgb = rgb
+        self.cmd_sent = 0  # 已发送的命令数量
+        self.cmd_skipped = 0  # 因地址未变化而省略的 CASET / RASET 命令数量
+        self._invalidate_window()
+        self.fill_chunk = max(2, min(fill_chunk, _MAX_FILL_CHUNK) & ~1)  # 每个像素 2 字节，至少 1 个像素
+        self._fill_patterns = {}  # 颜色: (填充数据, memoryview)
         self.hard_reset()
         self.soft_reset()
         self.poweron()
@@ -185,6 +194,7 @@ class ST7735:
         """SPI write to the device: commands and data."""
         self.cs(0)
         if command is not None:
+            self.cmd_sent += 1
             self.dc(0)
             self.spi.write(bytes([command]))
         if data is not None:
@@ -199,6 +209,7 @@ class ST7735:
         Args:
             cmd: 命令内容
         """
+        self.cmd_sent += 1
         self.cs(0)
         self.dc(0)
         self.spi.write(bytes([cmd]))
@@ -228,6 +239,7 @@ class ST7735:
         self.res(1)
         sleep_ms(150)
         self.cs(1)
+        self._invalidate_window()
 
     def soft_reset(self):
         """
@@ -235,6 +247,7 @@ class ST7735:
         """
         self._write(SWRESET)
         sleep_ms(150)
+        self._invalidate_window()
 
     def poweron(self):
         """Disable display sleep mode."""
@@ -285,6 +298,7 @@ class ST7735:
             )
 
         self.width, self.height, self.x_start, self.y_start = table[rotate]
+        self._invalidate_window()
         self._write(MADCTL, bytes([madctl | (0x00 if self._rgb else 0x08)]))
 
     def _set_columns(self, start, end):
@@ -296,8 +310,14 @@ class ST7735:
             end (int): column end address
         """
         if start <= end <= self.width:
-            self._write(CASET, _encode_pos(
-                start + self.x_start, end + self.x_start))
+            start += self.x_start
+            end += self.x_start
+            if start == self._col_start and end == self._col_end:  # 与上一次的列地址相同
+                self.cmd_skipped += 1
+                return
+            self._write(CASET, _encode_pos(start, end))
+            self._col_start = start
+            self._col_end = end
 
     def _set_rows(self, start, end):
         """
@@ -308,8 +328,21 @@ class ST7735:
             end (int): row end address
        """
         if start <= end <= self.height:
-            self._write(RASET, _encode_pos(
-                start + self.y_start, end + self.y_start))
+            start += self.y_start
+            end += self.y_start
+            if start == self._row_start and end == self._row_end:  # 与上一次的行地址相同
+                self.cmd_skipped += 1
+                return
+            self._write(RASET, _encode_pos(start, end))
+            self._row_start = start
+            self._row_end = end
+
+    def _invalidate_window(self):
+        """
+        清除记录的窗口地址，下一次设置窗口时重新发送 CASET / RASET
+        """
+        self._col_start = self._col_end = -1
+        self._row_start = self._row_end = -1
 
     def set_window(self, x0, y0, x1, y1):
         """
@@ -450,16 +483,38 @@ class ST7735:
             h (int): Height in pixels
             c (int): 565 encoded color
         """
+        # 限制在屏幕范围内
+        if x < 0:
+            w += x
+            x = 0
+        if y < 0:
+            h += y
+            y = 0
+        w = min(w, self.width - x)
+        h = min(h, self.height - y)
+        if w <= 0 or h <= 0:
+            return
         self.set_window(x, y, x + w - 1, y + h - 1)
-        chunks, rest = divmod(w * h, _BUFFER_SIZE)
-        pixel = _encode_pixel(c)
+        pattern = self._fill_patterns.get(c)
+        if pattern is None:
+            if len(self._fill_patterns) >= _FILL_PATTERNS:
+                self._fill_patterns = {}
+            data = _encode_pixel(c) * (self.fill_chunk // 2)
+            pattern = (data, memoryview(data))
+            self._fill_patterns[c] = pattern
+        data, view = pattern
+        size = w * h * 2
+        chunk = len(data)
+        write = self.spi.write
+        # 整个矩形只拉低一次片选
+        self.cs(0)
         self.dc(1)
-        if chunks:
-            data = pixel * _BUFFER_SIZE
-            for _ in range(chunks):
-                self._write(None, data)
-        if rest:
-            self._write(None, pixel * rest)
+        while size >= chunk:
+            write(data)
+            size -= chunk
+        if size:
+            write(view[:size])
+        self.cs(1)
 
     def fill(self, c):
         """
@@ -492,17 +547,35 @@ class ST7735:
         dy = abs(y2 - y1)
         err = dx // 2
         ystep = 1 if y1 < y2 else -1
+        start = x1  # 当前连续线段的起点
         while x1 <= x2:
-            if steep:
-                self.pixel(y1, x1, c)
-            else:
-                self.pixel(x1, y1, c)
             err -= dy
+            if err < 0 or x1 == x2:  # 下一个点换行（列），将连续的像素作为一个矩形发送
+                if steep:
+                    self.fill_rect(y1, start, 1, x1 - start + 1, c)
+                else:
+                    self.fill_rect(start, y1, x1 - start + 1, 1, c)
+                start = x1 + 1
             if err < 0:
                 y1 += ystep
                 err += dx
             x1 += 1
 
+    def polyline(self, points, c, closed: bool = False):
+        """
+        Draw connected lines through the given points.
+
+        Args:
+            points: Sequence of (x, y) points
+            c (int): 565 encoded color
+            closed (bool): Connect the last point back to the first one
+        """
+        line = self.line
+        for i in range(1, len(points)):
+            line(*points[i - 1], *points[i], c)
+        if closed and len(points) > 2:
+            line(*points[-1], *points[0], c)
+
     def circle(self, x, y, radius, c, section=100):
         """
         画圆
@@ -512,15 +585,35 @@ class ST7735:
             x: 中心 x 坐标
             y: 中心 y 坐标
             radius: 半径
-            section: 分段
-        """
-        arr = []
-        for m in range(section + 1):
-            _x = round(radius * math.cos((2 * math.pi / section) * m - math.pi) + x)
-            _y = round(radius * math.sin((2 * math.pi / section) * m - math.pi) + y)
-            arr.append([_x, _y])
-        for i in range(len(arr) - 1):
-            self.line(*arr[i], *arr[i + 1], c)
+            section: 分段（仅为兼容保留，圆按像素逐行绘制）
+        """
+        fill_rect = self.fill_rect
+        _x = radius
+        _y = 0
+        err = 1 - radius
+        start = 0  # 当前连续线段的起点
+        while _x >= _y:
+            # 中点画圆法，计算下一个点
+            next_y = _y + 1
+            if err < 0:
+                next_x = _x
+                err += 2 * next_y + 1
+            else:
+                next_x = _x - 1
+                err += 2 * (next_y - next_x) + 1
+            if next_x != _x or next_x < next_y:  # 下一个点换列，将八个方向上连续的像素作为矩形发送
+                length = _y - start + 1
+                fill_rect(x + _x, y + start, 1, length, c)
+                fill_rect(x - _x, y + start, 1, length, c)
+                fill_rect(x + _x, y - _y, 1, length, c)
+                fill_rect(x - _x, y - _y, 1, length, c)
+                fill_rect(x + start, y + _x, length, 1, c)
+                fill_rect(x - _y, y + _x, length, 1, c)
+                fill_rect(x + start, y - _x, length, 1, c)
+                fill_rect(x - _y, y - _x, length, 1, c)
+                start = next_y
+            _x = next_x
+            _y = next_y
 
     def fill_circle(self, x, y, radius, c):
         """
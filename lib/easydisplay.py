@@ -14,12 +14,141 @@
 # 灰度化、二值化：https://blog.csdn.net/li_wen01/article/details/72867057
 # Framebuffer 的 Palette: https://forum.micropython.org/viewtopic.php?t=12857
 from io import BytesIO
+from array import array
 from struct import unpack
+from collections import OrderedDict
 from framebuf import FrameBuffer, MONO_HLSB, RGB565
 
+# Question mark icon for characters missing in the font 字体中不存在的字符显示为问号
+_UNKNOWN = b'\xff\xff\xff\xff\xff\xff\xff\xff\xf0\x0f\xcf\xf3\xcf\xf3\xff\xf3\xff\xcf\xff?\xff?\xff\xff\xff' \
+           b'?\xff?\xff\xff\xff\xff'
+_POOL_SIZE = 8  # Maximum number of pooled palettes / strip FrameBuffers 调色板 和 行缓冲区 FrameBuffer 的最大复用数量
+
+
+class SizedFrameBuffer(FrameBuffer):
+    def __init__(self, buffer, width: int, height: int, format: int):
+        """
+        FrameBuffer that keeps its size, so drivers can track the area touched by blit()
+        记录自身大小的 FrameBuffer，使驱动可以记录 blit() 修改的区域
+
+        Args:
+            buffer: Buffer 缓冲区
+            width: Width 宽度
+            height: Height 高度
+            format: Format 格式
+        """
+        super().__init__(buffer, width, height, format)
+        self.width = width
+        self.height = height
+
+
+def _rgb565_row(src, dst, width: int, lut: tuple):
+    """
+    Convert a row of 24-bit pixels into big endian RGB565 through lookup tables
+    通过查找表将一行 24 位像素转换为 大端序 的 RGB565
+
+    Args:
+        src: 24-bit pixels 24 位像素
+        dst: RGB565 buffer, at least width * 2 bytes RGB565 缓冲区，至少 width * 2 字节
+        width: Number of pixels 像素数量
+        lut: Tables returned by EasyDisplay._get_rgb565_lut() 查找表
+    """
+    h0, l0, h1, l1, h2, l2 = lut
+    j = 0
+    for i in range(0, width * 3, 3):
+        a = src[i]
+        b = src[i + 1]
+        c = src[i + 2]
+        dst[j] = h0[a] | h1[b] | h2[c]
+        dst[j + 1] = l0[a] | l1[b] | l2[c]
+        j += 2
+
+
+class HLSBScaler:
+    def __init__(self, old_size: int, new_size: int):
+        """
+        Scale HLSB characters with lookup tables built once per size pair
+        使用预先计算的查找表缩放 HLSB 字符，每组字号只需计算一次
+
+        Args:
+            old_size: Old char size 旧字符大小
+            new_size: New char size 新字符大小
+        """
+        self.old_size = old_size
+        self.new_size = new_size
+        src_stride = (old_size + 7) >> 3  # 源字符每行所占字节
+        self.stride = (new_size + 7) >> 3  # 新字符每行所占字节
+        r = range(new_size)
+        # 新字符每一行 对应的 源字符行的起始字节
+        self._rows = array("H", [(y * old_size // new_size) * src_stride for y in r])
+        # 整数倍放大时，直接查表将源字节展开为多个字节
+        if new_size % old_size == 0 and old_size % 8 == 0:
+            k = new_size // old_size
+            self._expand = bytearray(256 * k)
+            for b in range(256):
+                v = 0
+                for bit in range(8):
+                    if b & (0x80 >> bit):
+                        v |= ((1 << k) - 1) << ((7 - bit) * k)
+                self._expand[b * k:(b + 1) * k] = v.to_bytes(k, 'big')
+            self._k = k
+        else:
+            self._expand = None
+            # 新字符每一列 对应的 源字节偏移 和 位掩码
+            self._src_byte = bytearray([(x * old_size // new_size) >> 3 for x in r])
+            self._src_mask = bytearray([0x80 >> ((x * old_size // new_size) & 7) for x in r])
+            self._dst_mask = bytearray([0x80 >> (x & 7) for x in r])
+
+    def scale(self, data, out: bytearray = None) -> bytearray:
+        """
+        Scale HLSB Characters 缩放字符
+
+        Args:
+            data: Source char data 源字符数据
+            out: Buffer to write the scaled data into, allocated when None 写入缩放后数据的缓冲区，为 None 时新建
+
+        Returns:
+            Scaled character data 缩放后的数据
+        """
+        new_size = self.new_size
+        stride = self.stride
+        rows = self._rows
+        _t = bytearray(new_size * stride) if out is None else out
+        prev = -1
+        dst = 0
+        for y in range(new_size):
+            src = rows[y]
+            if src == prev:  # 与上一行相同时直接复制
+                for i in range(dst, dst + stride):
+                    _t[i] = _t[i - stride]
+            elif self._expand is not None:
+                k = self._k
+                expand = self._expand
+                d = dst
+                for i in range(src, src + stride // k):
+                    b = data[i] * k
+                    for j in range(k):
+                        _t[d + j] = expand[b + j]
+                    d += k
+            else:
+                src_byte = self._src_byte
+                src_mask = self._src_mask
+                dst_mask = self._dst_mask
+                v = 0
+                for x in range(new_size):
+                    if data[src + src_byte[x]] & src_mask[x]:
+                        v |= dst_mask[x]
+                    if x & 7 == 7 or x == new_size - 1:  # 每 8 个像素写入一个字节
+                        _t[dst + (x >> 3)] = v
+                        v = 0
+            prev = src
+            dst += stride
+        return _t
+
 
 class EasyDisplay:
     READ_SIZE = 32  # Limit the picture read size to prevent memory errors in low-performance development boards
+    SizedFrameBuffer = SizedFrameBuffer  # Also used by EasyMenu through the instance 也供 EasyMenu 通过实例使用
 
     def __init__(self, display,
                  color_type,
@@ -34,6 +163,9 @@ class EasyDisplay:
                  auto_wrap: bool = False,
                  half_char: bool = True,
                  line_spacing: int = 0,
+                 glyph_cache_size: int = 0,
+                 font_index: str = None,
+                 strip_size: int = 0,
                  *args, **kwargs):
         """
         初始化 EasyDisplay
@@ -67,6 +199,13 @@ class EasyDisplay:
                 半宽显示 ASCII 字符
             line_spacing: Line spacing for text
                 文本行间距
+            glyph_cache_size: Maximum bytes of glyph bitmaps kept in RAM, 0 disables the cache
+                字符点阵缓存的最大字节数，为 0 时不缓存
+            font_index: Font index mode, see load_font()
+                字体索引方式，详见 load_font()
+            strip_size: Bytes of the RGB565 strip buffer used to send a line of text at once (only applicable for
+                SPI direct driving), 0 sends each character separately
+                用于一次发送一行文本的 RGB565 缓冲区字节数（仅适用于 SPI 直接驱动），为 0 时逐字发送
         """
         self.display = display
         self._buffer = hasattr(display, 'buffer')  # buffer: 驱动是否使用了帧缓冲区，False（SPI 直接驱动） / True（Framebuffer）
@@ -89,8 +228,26 @@ class EasyDisplay:
         self.font_map_mode = None
         self.font_start_bitmap = None
         self.font_bitmap_size = None
+        self.font_index = None
+        self._font_codes = None  # 'ram' 索引：完整的字符编码表
+        self._font_pages = None  # 'page' 索引：每 256 个编码一项的分页表
+        self.glyph_cache_size = glyph_cache_size
+        self.glyph_hits = 0  # 字符点阵缓存命中次数
+        self.glyph_misses = 0  # 字符点阵缓存未命中次数
+        self._glyphs = OrderedDict()  # (code, size): (bitmap, FrameBuffer)
+        self._glyphs_used = 0
+        self._scalers = {}  # (old_size, new_size): HLSBScaler
+        self.strip_size = strip_size
+        self._strip = None  # 文本行缓冲区，首次使用时分配
+        self._strips = {}  # (width, size): (FrameBuffer, memoryview) 行缓冲区上的视图
+        self._palettes = {}  # (color, bg_color, color_type): 调色板
+        self._scratch = {}  # size: (bitmap, FrameBuffer) 未启用缓存时复用的字符点阵缓冲区
+        self._rgb_scratch = {}  # size: 直接驱动时复用的 RGB565 字符缓冲区
+        self.alloc_count = 0  # 缓冲区分配次数，用于确认重复刷新时不再分配内存
+        self._luts = {}  # (order, invert): RGB888 转 RGB565 查找表
+        self._lut_color = None  # 生成查找表时使用的颜色转换函数
         if font:
-            self.load_font(font)
+            self.load_font(font, font_index)
 
     # Framebuffer Function: https://docs.micropython.org/en/latest/library/framebuf.html
     def fill(self, *args, **kwargs):
@@ -163,8 +320,30 @@ class EasyDisplay:
             word: Character 字符
         """
         word_code = ord(word)
-        start = 0x10
-        end = self.font_start_bitmap
+        codes = self._font_codes
+        if codes is not None:  # 在内存中的编码表查找
+            start = 0
+            end = len(codes) - 1
+            while start <= end:
+                mid = (start + end) >> 1
+                target_code = codes[mid]
+                if word_code == target_code:
+                    return mid
+                elif word_code < target_code:
+                    end = mid - 1
+                else:
+                    start = mid + 1
+            return -1
+        pages = self._font_pages
+        if pages is not None:  # 通过分页表缩小文件中的查找范围
+            if word_code > 0xFFFF:
+                return -1
+            page = word_code >> 8
+            start = 0x10 + (pages[page] << 1)
+            end = 0x10 + ((pages[page + 1] - 1) << 1)
+        else:
+            start = 0x10
+            end = self.font_start_bitmap
         _seek = self._font.seek
         _font_read = self._font.read
         while start <= end:
@@ -179,7 +358,44 @@ class EasyDisplay:
                 start = mid + 2
         return -1
 
-    # @timeit
+    def _load_index(self, index: str):
+        """
+        Load Font Index 加载字体索引
+
+        Args:
+            index: 'ram' or 'page'
+        """
+        count = (self.font_start_bitmap - 0x10) >> 1  # 编码表中的字符数量
+        if index == "ram":
+            table = array("H", range(count))
+        else:
+            table = array("I", range(257))
+        chunk = bytearray(64)
+        _rinto = self._font.readinto
+        self._font.seek(0x10, 0)
+        i = 0
+        page = 0
+        while i < count:
+            n = min(_rinto(chunk), (count - i) << 1)
+            if not n:
+                break
+            for j in range(0, n - 1, 2):
+                code = chunk[j] << 8 | chunk[j + 1]
+                if index == "ram":
+                    table[i] = code
+                else:
+                    while page <= code >> 8:  # 记录每一页第一个字符在编码表中的位置
+                        table[page] = i
+                        page += 1
+                i += 1
+        if index == "ram":
+            self._font_codes = table
+        else:
+            while page <= 256:
+                table[page] = count
+                page += 1
+            self._font_pages = table
+
     @staticmethod
     def _hlsb_font_size(bytearray_data: bytearray, new_size: int, old_size: int) -> bytearray:
         """
@@ -193,46 +409,200 @@ class EasyDisplay:
         Returns:
             Scaled character data 缩放后的数据
         """
-        r = range(new_size)  # Preload functions to avoid repeated execution and improve efficiency
         if old_size == new_size:
             return bytearray_data
-        _t = bytearray(new_size * ((new_size >> 3) + 1))
-        _new_index = -1
-        for _col in r:
-            for _row in r:
-                if _row % 8 == 0:
-                    _new_index += 1
-                _old_index = int(_col / (new_size / old_size)) * old_size + int(_row / (new_size / old_size))
-                _t[_new_index] = _t[_new_index] | (
-                        (bytearray_data[_old_index >> 3] >> (7 - _old_index % 8) & 1) << (7 - _row % 8))
-        return _t
+        return HLSBScaler(old_size, new_size).scale(bytearray_data)
 
-    def get_bitmap(self, word: str) -> bytes:
+    def _get_scaler(self, old_size: int, new_size: int) -> HLSBScaler:
+        """
+        Get the cached scaler of a size pair 获取对应字号的缩放器
+        """
+        scaler = self._scalers.get((old_size, new_size))
+        if scaler is None:
+            scaler = HLSBScaler(old_size, new_size)
+            self._scalers[(old_size, new_size)] = scaler
+        return scaler
+
+    def get_bitmap(self, word: str, size: int = None) -> bytes:
         """
         Get Dot Matrix Image 获取点阵图
 
         Args:
             word: Single character 单个字符
+            size: Char size, defaults to the font size 字符大小，默认为字体文件的字号
 
         Returns:
             Bytes representing the dot matrix image of the character 字符点阵
         """
+        return bytes(self._get_glyph(word, size)[0])  # 复制一份，内部的缓冲区会被复用或缓存
+
+    def _get_glyph(self, word: str, size: int = None) -> tuple:
+        """
+        Get Dot Matrix Image and its FrameBuffer 获取点阵图 和 对应的 FrameBuffer
+
+        Args:
+            word: Single character 单个字符
+            size: Char size, defaults to the font size 字符大小，默认为字体文件的字号
+
+        Returns:
+            (bitmap, FrameBuffer), the buffers are reused by the next call when the glyph cache is disabled
+            (点阵, FrameBuffer)，未启用缓存时，缓冲区会在下一次调用时被复用
+        """
+        font_size = self.font_size
+        if size is None:
+            size = font_size
+        cache = self.glyph_cache_size
+        if cache:
+            key = (ord(word), size)
+            glyphs = self._glyphs
+            glyph = glyphs.get(key)
+            if glyph is not None:
+                self.glyph_hits += 1
+                glyphs[key] = glyphs.pop(key)  # 标记为最近使用
+                return glyph
+            self.glyph_misses += 1
         index = self._get_index(word)
         if index == -1:
-            return b'\xff\xff\xff\xff\xff\xff\xff\xff\xf0\x0f\xcf\xf3\xcf\xf3\xff\xf3\xff\xcf\xff?\xff?\xff\xff\xff' \
-                   b'?\xff?\xff\xff\xff\xff'  # Returns the question mark icon
-        self._font.seek(self.font_start_bitmap + index * self.font_bitmap_size, 0)
-        return self._font.read(self.font_bitmap_size)
+            data = bytearray(_UNKNOWN)  # Returns the question mark icon
+            self.alloc_count += 1
+        else:
+            self._font.seek(self.font_start_bitmap + index * self.font_bitmap_size, 0)
+            if cache and size == font_size:
+                data = bytearray(self.font_bitmap_size)
+                self.alloc_count += 1
+            else:  # 需要缩放的字符先读入复用的缓冲区
+                data = self._get_scratch(font_size)[0]
+            self._font.readinto(data)
+        if size != font_size:
+            data = self._get_scaler(font_size, size).scale(data, None if cache else self._get_scratch(size)[0])
+            if cache:
+                self.alloc_count += 1
+        if cache:
+            glyph = (data, SizedFrameBuffer(data, size, size, MONO_HLSB))
+            self.alloc_count += 1
+            length = len(data)
+            if length <= cache:
+                while self._glyphs_used + length > cache:  # 淘汰最久未使用的字符
+                    self._glyphs_used -= len(glyphs.pop(next(iter(glyphs)))[0])
+                glyphs[key] = glyph
+                self._glyphs_used += length
+            return glyph
+        scratch = self._get_scratch(size)
+        if data is not scratch[0]:  # 问号图标
+            self.alloc_count += 1
+            return data, SizedFrameBuffer(data, size, size, MONO_HLSB)
+        return scratch
+
+    def _get_scratch(self, size: int) -> tuple:
+        """
+        Get the reusable glyph buffer of a size 获取指定字号可复用的字符点阵缓冲区
+
+        Returns:
+            (bitmap, FrameBuffer)
+        """
+        scratch = self._scratch.get(size)
+        if scratch is None:
+            if size == self.font_size:
+                data = bytearray(self.font_bitmap_size)
+            else:
+                data = bytearray(size * ((size + 7) >> 3))
+            scratch = (data, SizedFrameBuffer(data, size, size, MONO_HLSB))
+            self._scratch[size] = scratch
+            self.alloc_count += 2
+        return scratch
+
+    def _get_palette(self, color: int, bg_color: int, color_type: str):
+        """
+        Get a pooled palette 获取复用的调色板
 
-    def load_font(self, file: str):
+        Args:
+            color: Main color 主体颜色
+            bg_color: Background color 背景颜色
+            color_type: "MONO" or "RGB565"
+        """
+        key = (color, bg_color, color_type)
+        palette = self._palettes.get(key)
+        if palette is None:
+            if color_type == "MONO":
+                palette = FrameBuffer(bytearray(1), 2, 1, MONO_HLSB)  # MONO pixels occupy 1 byte for every 8 pixels
+            elif color_type == "RGB565":
+                palette = FrameBuffer(bytearray(4), 2, 1, RGB565)  # RGB565 pixels occupy 2 bytes for every 1 pixel
+            else:
+                raise KeyError("Unsupported color_type: {}".format(color_type))
+            palette.pixel(1, 0, color)
+            palette.pixel(0, 0, bg_color)
+            if len(self._palettes) >= _POOL_SIZE:
+                self._palettes = {}
+            self._palettes[key] = palette
+            self.alloc_count += 2
+        return palette
+
+    def _get_rgb565_lut(self, dp_color, order: str, invert: bool = False) -> tuple:
+        """
+        Get the RGB888 to RGB565 lookup tables 获取 RGB888 转 RGB565 的查找表
+
+        Args:
+            dp_color: Color conversion function 颜色转换函数
+            order: Channel order of the source pixels, 'RGB' or 'BGR' 源像素的通道顺序
+            invert: Invert colors 反转颜色
+
+        Returns:
+            (high, low) byte tables for each byte of a pixel 像素中每个字节对应的 高位、低位 查找表
+        """
+        key = (order, invert)
+        lut = self._luts.get(key)
+        if lut is None or self._lut_color is not dp_color:
+            if self._lut_color is not dp_color:
+                self._luts = {}
+                self._lut_color = dp_color
+            lut = []
+            for channel in order:
+                high = bytearray(256)
+                low = bytearray(256)
+                for v in range(256):
+                    _v = 255 - v if invert else v
+                    if channel == 'R':
+                        c = dp_color(_v, 0, 0)
+                    elif channel == 'G':
+                        c = dp_color(0, _v, 0)
+                    else:
+                        c = dp_color(0, 0, _v)
+                    high[v] = c >> 8
+                    low[v] = c & 0xFF
+                lut.append(high)
+                lut.append(low)
+            lut = tuple(lut)
+            self._luts[key] = lut
+            self.alloc_count += 6
+        return lut
+
+    def clear_glyph_cache(self):
+        """
+        Clear the glyph cache 清空字符点阵缓存
+        """
+        self._glyphs = OrderedDict()
+        self._glyphs_used = 0
+        self._scratch = {}
+
+    def load_font(self, file: str, index: str = None):
         """
         Load Font File 加载字体文件
 
         Args:
             file: Path to the font file 文件路径
+            index: Index mode 索引方式
+                None: Binary search the code table in the font file (least memory)
+                    在字体文件中二分查找编码表（占用内存最少）
+                'ram': Load the whole code table into RAM (2 bytes per character)
+                    将完整的编码表加载到内存（每个字符 2 字节）
+                'page': Keep one entry per 256 codes in RAM to narrow the search in the font file (about 1 KB)
+                    在内存中为每 256 个编码保存一项，以缩小在字体文件中的查找范围（约 1 KB）
         """
+        if index not in (None, "ram", "page"):
+            raise ValueError("Unsupported font index: {}".format(index))
         self.font_file = file
         self._font = open(file, "rb")
+        self.clear_glyph_cache()
         # 获取字体文件信息
         #  字体文件信息大小 16 byte ,按照顺序依次是
         #   文件标识 2 byte
@@ -259,6 +629,12 @@ class EasyDisplay:
             self.size = int(self.font_size)
         # 点阵所占字节，用来定位字体数据位置
         self.font_bitmap_size = self.font_bmf_info[8]
+        # 字体索引
+        self.font_index = index
+        self._font_codes = None
+        self._font_pages = None
+        if index:
+            self._load_index(index)
 
     def text(self, s: str, x: int, y: int,
              color: int = None, bg_color: int = None, size: int = None,
@@ -333,19 +709,15 @@ class EasyDisplay:
             color, bg_color = bg_color, color
 
         # 配置调色板
-        if color_type == "MONO":
-            palette = FrameBuffer(bytearray(1), 2, 1, MONO_HLSB)  # MONO pixels occupy 1 byte for every 8 pixels
-        elif color_type == "RGB565":
-            palette = FrameBuffer(bytearray(4), 2, 1, RGB565)  # RGB565 pixels occupy 2 bytes for every 1 pixel
-        else:
-            raise KeyError("Unsupported color_type: {}".format(color_type))
-        palette.pixel(1, 0, color)
-        palette.pixel(0, 0, bg_color)
+        palette = self._get_palette(color, bg_color, color_type)
 
         # 清屏
         if clear:
             self.clear()
 
+        strip_size = self.strip_size
+        run = []  # 等待拼接发送的字符
+        run_x = run_y = run_end = 0
         for char in s:
             if auto_wrap and ((x + font_offset > dp.width and ord(char) < 128 and half_char) or
                               (x + font_size > dp.width and (not half_char or ord(char) > 128))):
@@ -367,28 +739,41 @@ class EasyDisplay:
             if x > dp.width or y > dp.height:
                 continue
 
-            # 获取字体的点阵数据
-            byte_data = self.get_bitmap(char)
-
-            # 准备并缩放字符数据
-            byte_data = bytearray(byte_data)
-            if font_size != self.font_size:
-                byte_data = self._hlsb_font_size(byte_data, font_size, self.font_size)
-
             # 显示字符
-            fbuf = FrameBuffer(byte_data, font_size, font_size, MONO_HLSB)
             if self._buffer:  # FrameBuffer Driven
-                dp.blit(fbuf, x, y, key, palette)
+                dp.blit(self._get_glyph(char, font_size)[1], x, y, key, palette)
             else:
-                if color_type == "RGB565":
-                    n_fbuf = FrameBuffer(bytearray(font_size * font_size * 2), font_size, font_size, RGB565)
-                    n_fbuf.blit(fbuf, 0, 0, key, palette)  # Render black and white pixels to color
-                elif color_type == "MONO":
-                    n_fbuf = fbuf  # Not tested
+                if run and (y != run_y or x > run_end or
+                            (min(x + font_size, dp.width) - run_x) * font_size * 2 > strip_size):
+                    self._write_run(run, run_x, run_y, font_size, key, palette)  # 无法继续拼接时，发送当前行
+                    run = []
+                if (strip_size and color_type == "RGB565" and x < dp.width and
+                        y + font_size <= dp.height and font_size * font_size * 2 <= strip_size):
+                    if not run:
+                        run_x = x
+                        run_y = y
+                    run.append((x, char))  # 先将字符拼接为一行，稍后一次发送
+                    run_end = x + font_size
                 else:
-                    raise ValueError("Unsupported color_type: {}".format(color_type))
-                dp.set_window(x, y, x + font_size - 1, y + font_size - 1)
-                dp.write_data(n_fbuf)
+                    if run:
+                        self._write_run(run, run_x, run_y, font_size, key, palette)
+                        run = []
+                    fbuf = self._get_glyph(char, font_size)[1]
+                    if color_type == "RGB565":
+                        n_fbuf = self._rgb_scratch.get(font_size)
+                        if n_fbuf is None:
+                            n_fbuf = FrameBuffer(bytearray(font_size * font_size * 2), font_size, font_size, RGB565)
+                            self._rgb_scratch[font_size] = n_fbuf
+                            self.alloc_count += 2
+                        elif key is not None and key != -1:
+                            n_fbuf.fill(0)  # 透明部分保持与新分配的缓冲区一致
+                        n_fbuf.blit(fbuf, 0, 0, key, palette)  # Render black and white pixels to color
+                    elif color_type == "MONO":
+                        n_fbuf = fbuf  # Not tested
+                    else:
+                        raise ValueError("Unsupported color_type: {}".format(color_type))
+                    dp.set_window(x, y, x + font_size - 1, y + font_size - 1)
+                    dp.write_data(n_fbuf)
 
             # 英文字符半格显示
             if ord(char) < 128 and half_char:
@@ -396,8 +781,43 @@ class EasyDisplay:
             else:
                 x += font_size
 
+        if run:
+            self._write_run(run, run_x, run_y, font_size, key, palette)
         self.show() if show else 0
 
+    def _write_run(self, run: list, x: int, y: int, size: int, key: int, palette):
+        """
+        Send a line of characters with a single window 将一行字符拼接后通过一个窗口发送到屏幕
+
+        Args:
+            run: (x, char) of the characters 字符的 x 坐标 和 字符
+            x: X-coordinate of the line 行起始 x 坐标
+            y: Y-coordinate of the line 行起始 y 坐标
+            size: Font size 字号
+            key: Transparent color 透明色
+            palette: Palette 调色板
+        """
+        dp = self.display
+        width = min(run[-1][0] + size, dp.width) - x  # 超出屏幕的部分不发送
+        if self._strip is None:
+            self._strip = bytearray(self.strip_size)
+            self.alloc_count += 1
+        strip = self._strips.get((width, size))
+        if strip is None:
+            buf = memoryview(self._strip)[:width * size * 2]
+            strip = (FrameBuffer(buf, width, size, RGB565), buf)
+            if len(self._strips) >= _POOL_SIZE:
+                self._strips = {}
+            self._strips[(width, size)] = strip
+            self.alloc_count += 2
+        strip, buf = strip
+        for _x, char in run:
+            _x -= x
+            strip.fill_rect(_x, 0, size, size, 0)  # 与逐字发送时一样，后一个字符覆盖前一个字符的重叠部分
+            strip.blit(self._get_glyph(char, size)[1], _x, 0, key, palette)
+        dp.set_window(x, y, x + width - 1, y + size - 1)
+        dp.write_data(buf)
+
     def ppm(self, *args, **kwargs):
         self.pbm(*args, **kwargs)
 
@@ -470,18 +890,11 @@ class EasyDisplay:
                 if invert:
                     color, bg_color = bg_color, color
                 # 配置调色板
-                if color_type == "MONO":
-                    palette = FrameBuffer(bytearray(1), 2, 1, MONO_HLSB)
-                elif color_type == "RGB565":
-                    palette = FrameBuffer(bytearray(4), 2, 1, RGB565)
-                else:
-                    raise KeyError("Unsupported color_type: {}".format(color_type))
-                palette.pixel(1, 0, color)
-                palette.pixel(0, 0, bg_color)
+                palette = self._get_palette(color, bg_color, color_type)
 
                 if self._buffer:  # Framebuffer 模式
                     data = bytearray(f_read())  # 读取并显示图像
-                    fbuf = FrameBuffer(data, _width, _height, MONO_HLSB)
+                    fbuf = SizedFrameBuffer(data, _width, _height, MONO_HLSB)
                     dp.blit(fbuf, x, y, key, palette)
                 else:  # 直接驱动
                     write_data = dp.write_data
@@ -516,63 +929,55 @@ class EasyDisplay:
 
             elif file_format == b"P6\n":  # P6 像素图 二进制
                 max_pixel_value = f.readline()  # 获取最大像素值
-                r_height = range(_height)
-                r_width = range(_width)
-                color_bytearray = bytearray(3)  # 为变量预分配内存
-                f_rinto = f.readinto
-                try:
-                    dp_color = dp.color
-                except AttributeError:
-                    dp_color = self.rgb565_color
-                dp_pixel = dp.pixel
-                if self._buffer:  # Framebuffer 模式
+                f_seek = f.seek
+                # 只读取屏幕内的部分
+                x0 = max(0, -x)
+                y0 = max(0, -y)
+                x1 = min(_width, dp.width - x)
+                y1 = min(_height, dp.height - y)
+                if x1 > x0 and y1 > y0:
+                    w = x1 - x0
+                    row = bytearray(w * 3)  # 一行可见像素的原始数据
+                    self.alloc_count += 1
                     if color_type == "RGB565":
-                        buffer = bytearray(_width * 2)
-                    for _y in r_height:  # 逐行显示图片
-                        for _x in r_width:
-                            f_rinto(color_bytearray)
-                            r, g, b = color_bytearray[0], color_bytearray[1], color_bytearray[2]
-                            if invert:
-                                r = 255 - r
-                                g = 255 - g
-                                b = 255 - b
-                            if color_type == "RGB565":
-                                buffer[_x * 2: (_x + 1) * 2] = dp_color(r, g, b).to_bytes(2, 'big')  # 通过索引赋值
-                            elif color_type == "MONO":
-                                _color = int((r + g + b) / 3) >= 127
-                                if _color:
-                                    _color = color
-                                else:
-                                    _color = bg_color
-                                if _color != key:  # 不显示指定颜色
-                                    dp_pixel(_x + x, _y + y, _color)
+                        try:
+                            dp_color = dp.color
+                        except AttributeError:
+                            dp_color = self.rgb565_color
+                        lut = self._get_rgb565_lut(dp_color, 'RGB', invert)
+                        buffer = bytearray(w * 2)
+                        self.alloc_count += 1
+                        if self._buffer:  # Framebuffer 模式
+                            fbuf = SizedFrameBuffer(buffer, w, 1, RGB565)
+                            self.alloc_count += 1
+                        else:  # 直接驱动
+                            dp.set_window(x + x0, y + y0, x + x1 - 1, y + y1 - 1)  # 设置窗口
+                    dp_pixel = dp.pixel
+                    r_width = range(0, w * 3, 3)
+                    skip = (_width - w) * 3  # 每行中不可见部分的字节数
+                    if y0 * _width + x0:
+                        f_seek((y0 * _width + x0) * 3, 1)  # 跳过屏幕外的像素
+                    for _y in range(y + y0, y + y1):  # 逐行显示图片
+                        f.readinto(row)
                         if color_type == "RGB565":
-                            fbuf = FrameBuffer(buffer, _width, 1, RGB565)
-                            dp.blit(fbuf, x, y + _y, key)
-                else:  # 直接驱动
-                    dp.set_window(x, y, x + _width - 1, y + _height - 1)  # 设置窗口
-                    buffer = bytearray(_width * 2)
-                    for _y in r_height:  # 逐行显示图片
-                        for _x in r_width:
-                            color_bytearray = f_read(3)
-                            r, g, b = color_bytearray[0], color_bytearray[1], color_bytearray[2]
-                            if invert:
-                                r = 255 - r
-                                g = 255 - g
-                                b = 255 - b
-                            if color_type == "RGB565":
-                                buffer[_x * 2: (_x + 1) * 2] = dp_color(
-                                    r, g, b).to_bytes(2, 'big')  # 通过索引赋值
-                            elif color_type == "MONO":
-                                _color = int((r + g + b) / 3) >= 127
-                                if _color:
+                            _rgb565_row(row, buffer, w, lut)
+                            if self._buffer:
+                                dp.blit(fbuf, x + x0, _y, key)
+                            else:
+                                dp.write_data(buffer)
+                        elif color_type == "MONO":
+                            for _x in r_width:
+                                _color = row[_x] + row[_x + 1] + row[_x + 2]
+                                if invert:  # 颜色反转
+                                    _color = 765 - _color
+                                if _color >= 381:  # 灰度 >= 127
                                     _color = color
                                 else:
                                     _color = bg_color
                                 if _color != key:  # 不显示指定颜色
-                                    dp_pixel(_x + x, _y + y, _color)
-                        if color_type == "RGB565":
-                            dp.write_data(buffer)
+                                    dp_pixel(_x // 3 + x + x0, _y, _color)
+                        if skip and _y < y + y1 - 1:
+                            f_seek(skip, 1)
             else:
                 raise TypeError("Unsupported File Format Type.")
 
@@ -633,7 +1038,6 @@ class EasyDisplay:
             f_read = f.read
             f_rinto = f.readinto
             f_seek = f.seek
-            f_tell = f.tell()
             dp = self.display
             try:
                 dp_color = dp.color
@@ -659,62 +1063,52 @@ class EasyDisplay:
                             flip = True
                         if _width > dp.width:  # Limit the maximum size of image display
                             _width = dp.width
+                            row = bytearray(_width * 3)  # 只读取屏幕内的像素
+                        else:
+                            row = bytearray(row_size)  # 一行像素的原始数据（包含行尾的填充字节）
                         if _height > dp.height:
                             _height = dp.height
-                        _color_bytearray = bytearray(3)  # 像素的二进制颜色
                         if clear:  # 清屏
                             self.clear()
-                        buffer = bytearray(_width * 2)
+                        self.alloc_count += 1
                         self_buf = self._buffer
-                        if not self_buf:
-                            dp.set_window(x, y, x + _width - 1, y + _height - 1)  # 设置窗口
-                        r_width = range(_width)
-                        r_height = range(_height)
-                        for _y in r_height:
+                        if color_type == "RGB565":
+                            lut = self._get_rgb565_lut(dp_color, 'BGR', invert)
+                            buffer = bytearray(_width * 2)
+                            self.alloc_count += 1
+                            if self_buf:
+                                fbuf = SizedFrameBuffer(buffer, _width, 1, RGB565)
+                                self.alloc_count += 1
+                            else:
+                                dp.set_window(x, y, x + _width - 1, y + _height - 1)  # 设置窗口
+                        r_width = range(0, _width * 3, 3)
+                        f_tell = -1
+                        for _y in range(_height):
                             if flip:
                                 pos = offset + (_height - 1 - _y) * row_size
                             else:
                                 pos = offset + _y * row_size
                             if f_tell != pos:
                                 f_seek(pos)  # 调整指针位置
-                            for _x in r_width:
-                                f_rinto(_color_bytearray)
-                                r, g, b = _color_bytearray[2], _color_bytearray[1], _color_bytearray[0]
-                                if invert:  # 颜色反转
-                                    r = 255 - r
-                                    g = 255 - g
-                                    b = 255 - b
-                                if self_buf:  # Framebuffer 模式
-                                    if color_type == "RGB565":
-                                        buffer[_x * 2: (_x + 1) * 2] = dp_color(
-                                            r, g, b).to_bytes(2, 'big')  # 通过索引赋值
-                                    elif color_type == "MONO":
-                                        _color = int((r + g + b) / 3) >= 127
-                                        if _color:
-                                            _color = color
-                                        else:
-                                            _color = bg_color
-                                        if _color != key:  # 不显示指定颜色
-                                            dp_pixel(_x + x, _y + y, _color)
-                                else:
-                                    if color_type == "RGB565":
-                                        buffer[_x * 2: (_x + 1) * 2] = dp_color(
-                                            r, g, b).to_bytes(2, 'big')  # 通过索引赋值
-                                    elif color_type == "MONO":
-                                        _color = int((r + g + b) / 3) >= 127
-                                        if _color:
-                                            _color = color
-                                        else:
-                                            _color = bg_color
-                                        if _color != key:  # 不显示指定颜色
-                                            dp_pixel(_x + x, _y + y, _color)
-
+                            f_rinto(row)  # 一次读取一整行
+                            f_tell = pos + len(row)
                             if color_type == "RGB565":
-                                if self_buf:
-                                    fbuf = FrameBuffer(buffer, _width, 1, RGB565)
+                                _rgb565_row(row, buffer, _width, lut)
+                                if self_buf:  # Framebuffer 模式
                                     dp.blit(fbuf, x, y + _y, key)
                                 else:
                                     dp.write_data(buffer)
+                            elif color_type == "MONO":
+                                for _x in r_width:
+                                    _color = row[_x] + row[_x + 1] + row[_x + 2]
+                                    if invert:  # 颜色反转
+                                        _color = 765 - _color
+                                    if _color >= 381:  # 灰度 >= 127
+                                        _color = color
+                                    else:
+                                        _color = bg_color
+                                    if _color != key:  # 不显示指定颜色
+                                        dp_pixel(_x // 3 + x, _y + y, _color)
 
                         self.show() if show else 0  # 立即显示
                     else:
@@ -722,7 +1116,7 @@ class EasyDisplay:
             else:
                 raise TypeError("Unsupported file type: only BMP images are supported.")
 
-    def dat(self, file, x, y, key=None):
+    def dat(self, file, x, y, key=None, show: bool = None, clear: bool = None):
         """
         Display screen raw data file, with extremely high efficiency, only supports RGB565 format.
         显示表示屏幕原始数据的文件，拥有极高的效率，仅支持 RGB565 格式
@@ -735,9 +1129,20 @@ class EasyDisplay:
             y: Y-coordinate  Y 坐标
             key: Specified color to be treated as transparent (only applicable in Framebuffer mode)
                 指定的颜色将被视为透明（仅适用于 Framebuffer 模式）
+            show: Show immediately (only applicable in Framebuffer mode)
+                立即显示（仅适用于 Framebuffer 模式）
+            clear: Clear screen
+                清理屏幕
         """
         if key is None:
             key = self._key
+        if show is None:
+            show = self._show
+        if clear is None:
+            clear = self._clear
+        if clear:  # 清屏
+            self.clear()
+        dp = self.display
         if isinstance(file, BytesIO):
             func = file
         else:
@@ -751,23 +1156,71 @@ class EasyDisplay:
                 if version == b'V1':  # 文件格式版本
                     _width, _height = f_readline().rstrip(b'\n').split(b' ')
                     _width, _height = int(_width), int(_height)
+                    row_size = _width * 2  # RGB565 每个像素占 2 字节
+                    # 屏幕内可见的部分
+                    x0 = max(0, -x)
+                    y0 = max(0, -y)
+                    x1 = min(_width, dp.width - x)
+                    y1 = min(_height, dp.height - y)
                     if self._buffer:  # Framebuffer 模式
-                        data = f_read(_width)
-                        dp_blit = self.display.blit
-                        y_offset = 0
-                        while data:
-                            buf = FrameBuffer(bytearray(data), _width, 1, RGB565)
-                            dp_blit(buf, x, y + y_offset, key)
-                            data = f_read(_width)
-                            y_offset += 1
-                    else:  # 直接驱动模式
-                        size = self.READ_SIZE * 10
-                        data = f_read(size)
-                        dp_write = self.display.write_data
-                        self.display.set_window(x, y, x + _width - 1, y + _height - 1)
-                        while data:
+                        buffer = getattr(dp, 'buffer', None)
+                        if key == -1 and self.color_type == "RGB565" and buffer is not None:
+                            # 不透明的图像直接读入屏幕缓冲区，不创建中间对象
+                            if x1 > x0 and y1 > y0:
+                                buffer = memoryview(buffer)
+                                stride = dp.width * 2
+                                start = (y + y0) * stride + (x + x0) * 2
+                                if y0 * _width + x0:
+                                    f.seek((y0 * _width + x0) * 2, 1)  # 跳过屏幕外的像素
+                                if x0 == 0 and x1 == _width == dp.width:  # 整行连续，一次读取
+                                    f.readinto(buffer[start:start + (y1 - y0) * stride])
+                                else:
+                                    size = (x1 - x0) * 2
+                                    skip = row_size - size  # 每行中不可见部分的字节数
+                                    for _y in range(y1 - y0):
+                                        f.readinto(buffer[start:start + size])
+                                        start += stride
+                                        if skip and _y < y1 - y0 - 1:
+                                            f.seek(skip, 1)
+                                register = getattr(dp, 'register_updates', None)
+                                if register:  # 直接写入缓冲区，需要通知驱动刷新该区域
+                                    register(y + y0, y + y1 - 1, x + x0, x + x1 - 1)
+                        else:  # 透明的图像逐行绘制，复用同一个行缓冲区
+                            data = bytearray(row_size)
+                            buf = SizedFrameBuffer(data, _width, 1, RGB565)
+                            self.alloc_count += 2
+                            dp_blit = dp.blit
+                            f_rinto = f.readinto
+                            for _y in range(y, y + _height):
+                                if f_rinto(data) != row_size:
+                                    break
+                                dp_blit(buf, x, _y, key)
+                    elif x0 == 0 and y0 == 0 and x1 == _width and y1 == _height:  # 直接驱动模式
+                        data = bytearray(self.READ_SIZE * 10)
+                        self.alloc_count += 1
+                        data_view = memoryview(data)
+                        f_rinto = f.readinto
+                        dp_write = dp.write_data
+                        dp.set_window(x, y, x + _width - 1, y + _height - 1)
+                        size = f_rinto(data)
+                        while size:
+                            dp_write(data_view[:size] if size < len(data) else data)
+                            size = f_rinto(data)
+                    elif x1 > x0 and y1 > y0:  # 直接驱动模式，只发送屏幕内的部分
+                        size = (x1 - x0) * 2
+                        skip = row_size - size
+                        data = bytearray(size)
+                        self.alloc_count += 1
+                        dp_write = dp.write_data
+                        dp.set_window(x + x0, y + y0, x + x1 - 1, y + y1 - 1)
+                        if y0 * _width + x0:
+                            f.seek((y0 * _width + x0) * 2, 1)  # 跳过屏幕外的像素
+                        for _y in range(y1 - y0):
+                            f.readinto(data)
                             dp_write(data)
-                            data = f_read(size)
+                            if skip and _y < y1 - y0 - 1:
+                                f.seek(skip, 1)
+                    self.show() if show else 0  # 立即显示
                 else:
                     raise TypeError("Unsupported Version: {}".format(version))
 
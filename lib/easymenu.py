@@ -2,6 +2,22 @@
 # Author: funnygeeker
 # Licence: MIT
 # Date: 2023/1/19
+import os
+from array import array
+from collections import OrderedDict
+from framebuf import FrameBuffer, MONO_HLSB, RGB565
+
+try:
+    from time import ticks_us, ticks_diff
+except ImportError:  # CPython
+    from time import perf_counter
+
+    def ticks_us():
+        return int(perf_counter() * 1000000)
+
+    def ticks_diff(a, b):
+        return a - b
+
 
 def _call(func, *args) -> str:
     """
@@ -26,17 +42,180 @@ def _call(func, *args) -> str:
     return '' if not result else str(result)
 
 
+def _bisect(table, x) -> int:
+    """
+    返回有序数组中第一个不小于 x 的元素的索引
+
+    Args:
+        table: 升序排列的数组
+        x: 查找的值
+    """
+    lo, hi = 0, len(table)
+    while lo < hi:
+        mid = (lo + hi) >> 1
+        if table[mid] < x:
+            lo = mid + 1
+        else:
+            hi = mid
+    return lo
+
+
+def _part(field, index: int):
+    """
+    读取 name / title / img / value 的内容或偏移，不将其展开为列表
+
+    Args:
+        field: MenuItem 中保存的原始值
+        index: 0: 内容, 1: x 偏移, 2: y 偏移
+    """
+    if isinstance(field, tuple) or isinstance(field, list):
+        return field[index]
+    return None if index else field
+
+
+class MenuProfiler:
+    PHASES = ('clear', 'title', 'call', 'text', 'img', 'border', 'cache', 'flush')
+    _SLOTS = {'call': 1, 'text': 2, 'img': 3, 'border': 4}  # 阶段在选项统计中的位置
+
+    def __init__(self, history: int = 32):
+        """
+        记录 EasyMenu.show() 和 show_options() 各阶段的耗时，通过 EasyMenu(profiler=...) 启用
+
+        Args:
+            history: 直方图保留的最近刷新次数
+        """
+        self._frames = array('I', [0] * history)  # 最近每次刷新的耗时 (us)，循环写入
+        self.reset()
+
+    def reset(self):
+        """
+        清零所有统计数据
+        """
+        self.phases = {}  # 阶段: [次数, 总耗时, 最大耗时]
+        for phase in self.PHASES:
+            self.phases[phase] = [0, 0, 0]
+        self.options = {}  # 选项: [次数, call, text, img, border, call 最大耗时]
+        self.frames = 0  # 刷新次数
+        self.total_us = 0
+        self.max_us = 0
+        self._pos = 0
+        self._start = self._last = ticks_us()
+
+    def begin(self):
+        """
+        开始一次刷新
+        """
+        self._start = self._last = ticks_us()
+
+    def lap(self, phase: str, option=None):
+        """
+        将上次记录以来的耗时计入指定阶段
+
+        Args:
+            phase: 阶段名称
+            option: 耗时所属的选项（可选）
+        """
+        now = ticks_us()
+        us = ticks_diff(now, self._last)
+        self._last = now
+        p = self.phases[phase]
+        p[0] += 1
+        p[1] += us
+        if us > p[2]:
+            p[2] = us
+        slot = self._SLOTS.get(phase) if option is not None else None
+        if slot:
+            o = self.options.get(option)
+            if o is None:
+                o = self.options[option] = [0, 0, 0, 0, 0, 0]
+            o[slot] += us
+            if slot == 1:
+                o[0] += 1
+                if us > o[5]:
+                    o[5] = us
+
+    def end(self):
+        """
+        结束一次刷新
+        """
+        us = ticks_diff(ticks_us(), self._start)
+        self.frames += 1
+        self.total_us += us
+        if us > self.max_us:
+            self.max_us = us
+        if len(self._frames):
+            self._frames[self._pos] = us
+            self._pos = (self._pos + 1) % len(self._frames)
+
+    def histogram(self) -> list:
+        """
+        最近刷新耗时的直方图
+
+        Returns:
+            [(耗时上限 ms, 次数), ...]，耗时上限依次为 1, 2, 4, 8 ... ms
+        """
+        count = min(self.frames, len(self._frames))
+        buckets = []
+        for i in range(count):
+            ms = self._frames[i] // 1000
+            b = 0
+            while ms:
+                ms >>= 1
+                b += 1
+            while len(buckets) <= b:
+                buckets.append(0)
+            buckets[b] += 1
+        return [(1 << i, n) for i, n in enumerate(buckets)]
+
+    def dump(self):
+        """
+        在 REPL 中打印统计结果
+        """
+        if not self.frames:
+            print('No frames')
+            return
+        print('frames: {}  avg: {:.2f} ms  max: {:.2f} ms'.format(
+            self.frames, self.total_us / self.frames / 1000, self.max_us / 1000))
+        print('{:<8}{:>8}{:>12}{:>10}'.format('phase', 'count', 'total ms', 'max us'))
+        for phase in self.PHASES:
+            p = self.phases[phase]
+            if p[0]:
+                print('{:<8}{:>8}{:>12.2f}{:>10}'.format(phase, p[0], p[1] / 1000, p[2]))
+        print('{:<16}{:>6}{:>10}{:>10}{:>10}{:>10}{:>10}'.format(
+            'option', 'count', 'call us', 'text us', 'img us', 'border us', 'call max'))
+        items = sorted(self.options.items(), key=lambda i: -sum(i[1][1:5]))
+        for option, o in items:
+            name = _part(option._raw_name, 0)
+            if not isinstance(name, str):
+                name = getattr(name, '__name__', '?')
+            print('{:<16}{:>6}{:>10}{:>10}{:>10}{:>10}{:>10}'.format(name[:15], o[0], o[1], o[2], o[3], o[4], o[5]))
+        print('last {} frames:'.format(min(self.frames, len(self._frames))))
+        for limit, n in self.histogram():
+            print('{:>6} ms {:>4} {}'.format('<' + str(limit), n, '#' * n))
+
+
 class EasyMenu:
-    def __init__(self, ed, menu):
+    def __init__(self, ed, menu, partial: bool = False, cache_size: int = 0, profiler: MenuProfiler = None):
         """
         初始化 EasyMenu 实例
 
         Args:
             ed: micropython-easydisplay 实例
             menu: 菜单，生成方式详见使用文档
+            partial: 局部刷新：在同一页面内移动光标时，仅重绘 移动前 和 移动后 的选项（可选）
+            cache_size: 选项渲染缓存的最大字节数，为 0 时不缓存（仅适用于 Framebuffer 驱动），
+                缓存仅保存选项区域 (spacing) 内的图像，超出该区域的文本或图片不会被缓存
+            profiler: MenuProfiler 实例，记录每次刷新各阶段的耗时（可选）
         """
         self.ed = ed
         self.menu = menu
+        self.partial = partial
+        self.damage = None  # 最近一次局部刷新的区域 (x, y, w, h)
+        self._shown = None  # 最近一次完整显示的 (菜单, 页面索引)
+        self.cache_size = cache_size
+        self._cache = OrderedDict()  # (选项, 是否被选中): [name, value, img, x, y, 位图, 字节数]
+        self._cache_used = 0
+        self.profiler = profiler
         self._update_conf()
 
     def _update_conf(self):
@@ -61,7 +240,7 @@ class EasyMenu:
         self._page_len = _page_len if _page_len <= self._menu_len else self._menu_len  # 实际页面长度应少于当前菜单长度
         # 起始点
         if menu.start is None:
-            if menu.title[0]:
+            if _part(menu._raw_title, 0):
                 menu.start = [0, self.ed.size + 3]
             else:
                 menu.start = [0, 0]
@@ -86,15 +265,43 @@ class EasyMenu:
         Args:
             num: 移动的次数（正整数或负整数）
         """
-        if num >= 0:
-            func = self.next
-        else:
-            func = self.prev
-        if num != 0:
-            num = abs(num)
-            for _ in range(num - 1):
-                func(False, False)
-            func()
+        menu = self.menu
+        if num != 0 and self._menu_len:
+            last = (menu.page_index, menu.option_index)
+            self._select(menu.page_index + menu.option_index + num, 1 if num > 0 else -1)
+            self._refresh(last)
+
+    def _select(self, index: int, step: int, check: bool = True):
+        """
+        直接跳转到指定的绝对索引，页面按页面长度对齐
+
+        Args:
+            index: 目标绝对索引，超出范围时循环
+            step: 目标选项被跳过时的查找方向，1 或 -1
+            check: 启用检查-该项是否可被选中
+        """
+        menu = self.menu
+        menu_len = self._menu_len
+        index %= menu_len
+        if check:
+            table = menu.selectable()
+            if table is None:  # ItemProvider：逐项查找，只读取经过的选项
+                items = menu.items
+                for _ in range(menu_len):
+                    if not items[index].skip:
+                        break
+                    index = (index + step) % menu_len
+            elif table:  # 所有选项都被跳过时停在目标索引
+                i = _bisect(table, index)
+                if step > 0:
+                    index = table[i] if i < len(table) else table[0]
+                else:
+                    if i == len(table) or table[i] != index:
+                        i -= 1
+                    index = table[i]  # i 为 -1 时回到最后一个可选项
+        option_index = index % self._page_len
+        menu.page_index = index - option_index
+        menu.option_index = option_index
 
     def prev_line(self):
         """移到 上一行"""
@@ -112,14 +319,11 @@ class EasyMenu:
             show: 立即显示更改
             check: 启用检查-该项是否可被选中
         """
-        i = True
-        while i:
-            self.menu.option_index -= 1
-            if self.menu.option_index < 0:  # 向前翻页
-                self.prev_page(show=False, check=False)
-            i = self.get_option().skip if check else False
+        menu = self.menu
+        last = (menu.page_index, menu.option_index)
+        self._select(menu.page_index + menu.option_index - 1, -1, check)
         if show:
-            self.show()
+            self._refresh(last)
 
     def next(self, show=True, check=True):
         """
@@ -129,20 +333,11 @@ class EasyMenu:
             show: 立即显示更改
             check: 启用检查-该项是否可被选中
         """
-        i = True
         menu = self.menu
-        while i:
-            last_page_len = self._menu_len % self._page_len
-            if not last_page_len:
-                last_page_len = self._page_len
-            menu.option_index += 1
-            if (menu.option_index >= self._page_len or
-                    (menu.page_index + self._page_len > self._menu_len and
-                     menu.option_index > last_page_len - 1)):  # 选项超出页面索引 或者 当前为最后一页，且超出当前页索引
-                self.next_page(show=False, check=False)
-            i = self.get_option().skip if check else False
+        last = (menu.page_index, menu.option_index)
+        self._select(menu.page_index + menu.option_index + 1, 1, check)
         if show:
-            self.show()
+            self._refresh(last)
 
     def prev_page(self, show=True, check=True):
         """
@@ -354,7 +549,7 @@ class EasyMenu:
         """
         item = self.get_option()
         result = _call(item.callback)  # 执行当前项的回调函数，可以在回调函数中用于生成子菜单
-        if len(item.items) > 0:  # 存在选项（menu 不为空）则存在菜单
+        if len(item._items) > 0:  # 存在选项（menu 不为空）则存在菜单
             self.menu = item
             self.menu.page_index = 0
             self.menu.option_index = 0
@@ -382,6 +577,9 @@ class EasyMenu:
         menu = self.menu
         dp = self.ed.display
         ms = menu.style
+        prof = self.profiler
+        if prof:
+            prof.begin()
         # 清理屏幕
         if menu.clear:
             mc = menu.clear
@@ -389,97 +587,261 @@ class EasyMenu:
                          mc[3] - mc[1] + 1, 0)
         else:
             dp.fill(0)
+        if prof:
+            prof.lap('clear')
         # 显示菜单元素
         # 标题
-        title = _call(menu.title[0])
+        raw = menu._raw_title
+        title = _call(_part(raw, 0))
         if title:
-            menu_x = ms['title'][0] if menu.title[1] is None else menu.title[1]
-            menu_y = ms['title'][1] if menu.title[2] is None else menu.title[2]
+            menu_x = ms['title'][0] if _part(raw, 1) is None else raw[1]
+            menu_y = ms['title'][1] if _part(raw, 2) is None else raw[2]
             self.text(title, menu_x, menu_y)
             # 标题下的横线
             if ms.get('title-line'):
                 dp.hline(0, self.ed.size + 1, dp.width, self.ed.color)
+        if prof:
+            prof.lap('title')
         # 显示选项内容
-        layout_x = 0
-        layout_y = 0
         for index, option in enumerate(self.get_page()):  # 逐个显示选项
-            # 元素在布局中的坐标
-            if layout_x > menu.layout[0] - 1:
-                layout_y += 1
-                layout_x = 0
-            # 元素的起始坐标
-            start_x = menu.start[0] + menu.spacing[0] * layout_x
-            start_y = menu.start[1] + menu.spacing[1] * layout_y
-            invert = False  # 文本颜色反转
-
-            # 名称
-            name = _call(option.name[0])
-            n_offset_x = ms['name'][0] if option.name[1] is None else option.name[1]
-            n_offset_y = ms['name'][1] if option.name[2] is None else option.name[2]
-            # name 是否使用了 Align 对齐
-            name_start = [0, 0]
-            if isinstance(n_offset_x, int):
-                name_x = start_x + n_offset_x
-            else:
-                name_x = n_offset_x
-                name_start[0] = start_x
-            if isinstance(n_offset_y, int):
-                name_y = start_y + n_offset_y
-            else:
-                name_y = n_offset_y
-                name_start[1] = start_y
-
-            # 数值
-            value = _call(option.value[0])
-            v_offset_x = ms['value'][0] if option.value[1] is None else option.value[1]
-            v_offset_y = ms['value'][1] if option.value[2] is None else option.value[2]
-            # value 是否使用了 Align 对齐
-            value_start = [0, 0]
-            if isinstance(v_offset_x, int):
-                value_x = start_x + v_offset_x
-            else:
-                value_x = v_offset_x
-                value_start[0] = start_x
-            if isinstance(v_offset_y, int):
-                value_y = start_y + v_offset_y
-            else:
-                value_y = v_offset_y
-                value_start[1] = start_y
-
-            if index == menu.option_index and ms.get('text-invert'):  # 被选中的选项文字反色
-                invert = True
-                # 显示选中的外边框
-                if ms.get('border'):
-                    dp.fill_rect(start_x, start_y, menu.spacing[0], menu.spacing[1], self.ed.color)
-                self.text(name, name_x, name_y, invert=invert, start=name_start,
-                          spacing=menu.spacing)  # 为正常显示英文结尾的背景像素点，必须放在像素点绘制前显示文字
-                self.text(value, value_x, value_y, invert=invert, start=value_start, spacing=menu.spacing)
-                if ms.get('border-pixel'):
-                    for _x in [start_x, start_x + menu.spacing[0] - 1]:
-                        for _y in [start_y, start_y + menu.spacing[1] - 1]:
-                            dp.pixel(_x, _y, self.ed.bg_color)
-            else:
-                self.text(name, name_x, name_y, invert=invert, start=name_start, spacing=menu.spacing)
-                self.text(value, value_x, value_y, invert=invert, start=value_start, spacing=menu.spacing)
-
-            # 显示选项图片
-            img = _call(option.img[0])
-            if img:
-                invert = False
-                if ms.get('img-invert') and index == menu.option_index:  # 启用图片反色且选项被选中
-                    invert = True
-                i_offset_x = option.img[1] if option.img[1] is not None else ms['img'][0]
-                i_offset_y = option.img[2] if option.img[2] is not None else ms['img'][1]
-                self.img(img, start_x + i_offset_x, start_y + i_offset_y, invert=invert)
-
-            layout_x += 1
+            start_x, start_y = self._option_start(index)
+            self._show_option(index, option, start_x, start_y)
+        self._shown = (menu, menu.page_index)
         try:
             if show:
                 dp.show()
         except AttributeError:
             pass
+        if prof:
+            prof.lap('flush')
+            prof.end()
         return True
 
+    def show_options(self, *indexes, show=True):
+        """
+        仅重绘当前页面中的指定选项，并将重绘区域提交给屏幕驱动
+
+        Args:
+            *indexes: 选项在当前页面中的索引
+            show: 是否立即显示
+
+        Notes:
+            仅重绘选项所在的区域 (spacing)，超出该区域的文本或图片不会被清除
+        """
+        menu = self.menu
+        dp = self.ed.display
+        page = self.get_page()
+        prof = self.profiler
+        if prof:
+            prof.begin()
+        x0 = y0 = x1 = y1 = None
+        for index in indexes:
+            if index >= len(page):
+                continue
+            start_x, start_y = self._option_start(index)
+            end_x = start_x + menu.spacing[0]
+            end_y = start_y + menu.spacing[1]
+            dp.fill_rect(start_x, start_y, menu.spacing[0], menu.spacing[1], 0)
+            if prof:
+                prof.lap('clear')
+            self._show_option(index, page[index], start_x, start_y)
+            if x0 is None:
+                x0, y0, x1, y1 = start_x, start_y, end_x, end_y
+            else:
+                x0, y0, x1, y1 = min(x0, start_x), min(y0, start_y), max(x1, end_x), max(y1, end_y)
+        if x0 is None:
+            return False
+        self.damage = (x0, y0, x1 - x0, y1 - y0)
+        if show:
+            show_rect = getattr(dp, 'show_rect', None)
+            if show_rect:  # 驱动支持局部刷新
+                show_rect(*self.damage)
+            else:
+                try:
+                    dp.show()
+                except AttributeError:
+                    pass
+        if prof:
+            prof.lap('flush')
+            prof.end()
+        return True
+
+    def _refresh(self, last):
+        """
+        移动光标后刷新屏幕，若启用局部刷新且仍在同一页面，则只重绘移动前后的两个选项
+
+        Args:
+            last: 移动前的 (page_index, option_index)
+        """
+        menu = self.menu
+        if (self.partial and self._shown is not None and self._shown[0] is menu and
+                self._shown[1] == menu.page_index == last[0]):
+            if last[1] != menu.option_index:
+                self.show_options(last[1], menu.option_index)
+        else:
+            self.show()
+
+    def _option_start(self, index: int) -> tuple:
+        """
+        计算当前页面中选项的起始坐标
+
+        Args:
+            index: 选项在当前页面中的索引
+        """
+        menu = self.menu
+        layout_y, layout_x = divmod(index, menu.layout[0])  # 元素在布局中的坐标
+        return menu.start[0] + menu.spacing[0] * layout_x, menu.start[1] + menu.spacing[1] * layout_y
+
+    def _show_option(self, index: int, option, start_x: int, start_y: int):
+        """
+        显示单个选项
+
+        Args:
+            index: 选项在当前页面中的索引
+            option: 选项
+            start_x: 选项的起始 x 坐标
+            start_y: 选项的起始 y 坐标
+        """
+        menu = self.menu
+        dp = self.ed.display
+        ms = menu.style
+        prof = self.profiler
+        invert = False  # 文本颜色反转
+        selected = index == menu.option_index
+        raw_name = option._raw_name
+        raw_value = option._raw_value
+        raw_img = option._raw_img
+        name = _call(_part(raw_name, 0))
+        value = _call(_part(raw_value, 0))
+        img = _call(_part(raw_img, 0))
+        if prof:
+            prof.lap('call', option)
+        if self.cache_size:  # 内容未发生变化时，直接使用缓存的位图
+            entry = self._cache.get((option, selected))
+            if entry is not None and entry[:5] == [name, value, img, start_x, start_y]:
+                self._cache[(option, selected)] = self._cache.pop((option, selected))
+                dp.blit(entry[5], start_x, start_y)
+                if prof:
+                    prof.lap('cache', option)
+                return
+            dp.fill_rect(start_x, start_y, menu.spacing[0], menu.spacing[1], 0)  # 保证缓存的图像与直接显示时一致
+            if prof:
+                prof.lap('clear')
+
+        # 名称
+        n_offset_x = ms['name'][0] if _part(raw_name, 1) is None else raw_name[1]
+        n_offset_y = ms['name'][1] if _part(raw_name, 2) is None else raw_name[2]
+        # name 是否使用了 Align 对齐
+        name_start = [0, 0]
+        if isinstance(n_offset_x, int):
+            name_x = start_x + n_offset_x
+        else:
+            name_x = n_offset_x
+            name_start[0] = start_x
+        if isinstance(n_offset_y, int):
+            name_y = start_y + n_offset_y
+        else:
+            name_y = n_offset_y
+            name_start[1] = start_y
+
+        # 数值
+        v_offset_x = ms['value'][0] if _part(raw_value, 1) is None else raw_value[1]
+        v_offset_y = ms['value'][1] if _part(raw_value, 2) is None else raw_value[2]
+        # value 是否使用了 Align 对齐
+        value_start = [0, 0]
+        if isinstance(v_offset_x, int):
+            value_x = start_x + v_offset_x
+        else:
+            value_x = v_offset_x
+            value_start[0] = start_x
+        if isinstance(v_offset_y, int):
+            value_y = start_y + v_offset_y
+        else:
+            value_y = v_offset_y
+            value_start[1] = start_y
+
+        if selected and ms.get('text-invert'):  # 被选中的选项文字反色
+            invert = True
+            # 显示选中的外边框
+            if ms.get('border'):
+                dp.fill_rect(start_x, start_y, menu.spacing[0], menu.spacing[1], self.ed.color)
+            if prof:
+                prof.lap('border', option)
+            self.text(name, name_x, name_y, invert=invert, start=name_start,
+                      spacing=menu.spacing)  # 为正常显示英文结尾的背景像素点，必须放在像素点绘制前显示文字
+            self.text(value, value_x, value_y, invert=invert, start=value_start, spacing=menu.spacing)
+            if prof:
+                prof.lap('text', option)
+            if ms.get('border-pixel'):
+                for _x in [start_x, start_x + menu.spacing[0] - 1]:
+                    for _y in [start_y, start_y + menu.spacing[1] - 1]:
+                        dp.pixel(_x, _y, self.ed.bg_color)
+            if prof:
+                prof.lap('border', option)
+        else:
+            self.text(name, name_x, name_y, invert=invert, start=name_start, spacing=menu.spacing)
+            self.text(value, value_x, value_y, invert=invert, start=value_start, spacing=menu.spacing)
+            if prof:
+                prof.lap('text', option)
+
+        # 显示选项图片
+        if img:
+            invert = False
+            if ms.get('img-invert') and selected:  # 启用图片反色且选项被选中
+                invert = True
+            i_offset_x = raw_img[1] if _part(raw_img, 1) is not None else ms['img'][0]
+            i_offset_y = raw_img[2] if _part(raw_img, 2) is not None else ms['img'][1]
+            self.img(img, start_x + i_offset_x, start_y + i_offset_y, invert=invert)
+            if prof:
+                prof.lap('img', option)
+
+        if self.cache_size:
+            self._cache_option(option, selected, [name, value, img, start_x, start_y])
+            if prof:
+                prof.lap('cache')
+
+    def _cache_option(self, option, selected: bool, entry: list):
+        """
+        将选项所在区域的图像保存到渲染缓存，超出缓存大小时淘汰最久未使用的选项
+
+        Args:
+            option: 选项
+            selected: 选项是否被选中
+            entry: [name, value, img, x, y]
+        """
+        dp = self.ed.display
+        if not hasattr(dp, 'buffer'):  # 直接驱动无法读取屏幕上的图像
+            return
+        w, h = self.menu.spacing
+        # 记录自身大小的 FrameBuffer 使驱动只标记选项区域，旧版本的 EasyDisplay 没有该属性
+        fb = getattr(self.ed, 'SizedFrameBuffer', FrameBuffer)
+        if self.ed.color_type == "RGB565":
+            size = w * h * 2
+            fbuf = None if size > self.cache_size else fb(bytearray(size), w, h, RGB565)
+        else:
+            size = ((w + 7) >> 3) * h
+            fbuf = None if size > self.cache_size else fb(bytearray(size), w, h, MONO_HLSB)
+        cache = self._cache
+        old = cache.pop((option, selected), None)
+        if old is not None:
+            self._cache_used -= old[6]
+        if fbuf is None:
+            return
+        while cache and self._cache_used + size > self.cache_size:  # 淘汰最久未使用的选项
+            self._cache_used -= cache.pop(next(iter(cache)))[6]
+        fbuf.blit(dp, -entry[3], -entry[4])  # 复制选项所在区域的图像
+        entry.append(fbuf)
+        entry.append(size)
+        cache[(option, selected)] = entry
+        self._cache_used += size
+
+    def clear_cache(self):
+        """
+        清空选项渲染缓存，修改菜单样式或布局后需要调用
+        """
+        self._cache = OrderedDict()
+        self._cache_used = 0
+
     def get_index(self) -> list:
         """
         获取当前选项的绝对索引
@@ -506,7 +868,97 @@ class EasyMenu:
         return menu.items[menu.page_index + menu.option_index]
 
 
+class ItemProvider:
+    def __init__(self, window: int = 16):
+        """
+        按需生成选项的数据源，可以作为 MenuItem 的 items 使用，只生成当前页面需要的选项
+        子类需要实现 __len__() 和 fetch()
+
+        Args:
+            window: 缓存的选项数量
+        """
+        self.window = window
+        self.parent = None  # 所属的菜单，由 MenuItem 设置
+        self._start = 0  # 缓存中第一个选项的索引
+        self._cache = []
+
+    def __len__(self) -> int:
+        """
+        返回选项的总数
+        """
+        raise NotImplementedError
+
+    def fetch(self, start: int, stop: int) -> list:
+        """
+        生成索引在 [start, stop) 范围内的选项
+
+        Args:
+            start: 起始索引
+            stop: 结束索引（不包含）
+
+        Returns:
+            [MenuItem, ...]
+        """
+        raise NotImplementedError
+
+    def invalidate(self):
+        """
+        清空缓存，数据源发生变化后需要调用
+        """
+        self._start = 0
+        self._cache = []
+
+    def _load(self, start: int, stop: int):
+        """
+        将 [start, stop) 范围内的选项读入缓存
+        """
+        items = self.fetch(start, stop)
+        parent = self.parent
+        for item in items:
+            if item.parent is None:
+                item.parent = parent
+        self._start = start
+        self._cache = items
+
+    def __getitem__(self, index):
+        length = len(self)
+        if isinstance(index, slice):
+            if index.step not in (None, 1):
+                raise ValueError('[ERROR] ItemProvider: Slice step is not supported')
+            start = 0 if index.start is None else index.start
+            stop = length if index.stop is None else index.stop
+            if start < 0:
+                start = max(0, start + length)
+            if stop < 0:
+                stop += length
+            stop = min(stop, length)
+            if start >= stop:
+                return []
+            if start < self._start or stop > self._start + len(self._cache):
+                self._load(start, min(length, start + max(self.window, stop - start)))
+            return self._cache[start - self._start:stop - self._start]
+        if index < 0:
+            index += length
+        if not 0 <= index < length:
+            raise IndexError('ItemProvider index out of range')
+        if not self._start <= index < self._start + len(self._cache):
+            start = index - index % self.window
+            self._load(start, min(length, start + self.window))
+        return self._cache[index - self._start]
+
+
+_NO_ITEMS = ()  # 未添加过选项的 MenuItem 共用的空选项列表
+_ITEM_DEFAULTS = {'_raw_name': '', '_raw_title': '', '_raw_img': '', '_raw_value': '', '_skip': False,
+                  '_items': _NO_ITEMS, 'clear': None, 'parent': None, 'start': None, 'style': None, 'layout': None,
+                  'spacing': None, 'page_index': 0, 'option_index': 0, 'callback': None, 'data': None,
+                  '_selectable': None, '_selectable_key': None}  # MenuItem 未设置的属性的默认值
+
+
 class MenuItem:
+    __slots__ = ('_raw_name', '_raw_title', '_raw_img', '_raw_value', '_skip', '_items', 'clear', 'parent',
+                 'start', 'style', 'layout', 'spacing', 'page_index', 'option_index', 'callback', 'data',
+                 '_selectable', '_selectable_key')
+
     def __init__(self,
                  name='',
                  title='',
@@ -531,7 +983,7 @@ class MenuItem:
             img: 作为选项时：显示的图片
             value: 作为选项时：显示的值
             skip: 作为选项时：跳过此选项，使其无法被框选
-            items: 作为菜单时：保存每个选项的列表
+            items: 作为菜单时：保存每个选项的列表，或 ItemProvider 实例
             clear: 作为菜单时：清理屏幕的区域
             parent: 作为菜单时：上级菜单
             start: 作为菜单时：选项显示起始点
@@ -540,33 +992,143 @@ class MenuItem:
             spacing: 作为菜单时：(x, y) 选项间隔
             callback: 被点击时调用的函数
             data: 附加数据
+
+        Notes:
+            只保存与默认值不同的属性，未设置的属性从 _ITEM_DEFAULTS 中读取
         """
+        # name / title / img / value 按原样保存，读取对应属性时才展开为 [内容, x 偏移, y 偏移]
+        if name != '':
+            self._raw_name = name
+        if title != '':
+            self._raw_title = title
+        if img != '':
+            self._raw_img = img
+        if value != '':
+            self._raw_value = value
+        if skip:
+            self.skip = skip
+        if items is not None:
+            if isinstance(items, ItemProvider):
+                items.parent = self
+            self._items = items
+        if clear is not None:
+            self.clear = clear
+        if parent is not None:
+            self.parent = parent
+        if start is not None:
+            self.start = start
+        if style is not None:
+            self.style = style
+        if layout is not None:
+            self.layout = layout
+        if spacing is not None:
+            self.spacing = spacing
+        if callback is not None:
+            self.callback = callback
+        if data is not None:
+            self.data = data
+
+    def __getattr__(self, name):
+        try:
+            return _ITEM_DEFAULTS[name]
+        except KeyError:
+            raise AttributeError(name)
+
+    @property
+    def name(self) -> list:
+        name = self._raw_name
         if not isinstance(name, tuple) and not isinstance(name, list):
-            name = [name, None, None]
+            name = self._raw_name = [name, None, None]
+        return name
+
+    @name.setter
+    def name(self, value):
+        self._raw_name = value
+
+    @property
+    def title(self) -> list:
+        title = self._raw_title
         if not isinstance(title, tuple) and not isinstance(title, list):
-            title = [title, None, None]
+            title = self._raw_title = [title, None, None]
+        return title
+
+    @title.setter
+    def title(self, value):
+        self._raw_title = value
+
+    @property
+    def img(self) -> list:
+        img = self._raw_img
         if not isinstance(img, tuple) and not isinstance(img, list):
-            img = [img, None, None]
+            img = self._raw_img = [img, None, None]
+        return img
+
+    @img.setter
+    def img(self, value):
+        self._raw_img = value
+
+    @property
+    def value(self) -> list:
+        value = self._raw_value
         if not isinstance(value, tuple) and not isinstance(value, list):
-            value = [value, None, None]
-        if items is None:
-            items = []
-        self.name = name
-        self.title = title
-        self.img = img
-        self.skip = skip
-        self.value = value
-        self.items = items
-        self.clear = clear
-        self.parent = parent
-        self.start = start
-        self.style = style
-        self.layout = layout
-        self.spacing = spacing
-        self.page_index = 0
-        self.option_index = 0
-        self.callback = callback
-        self.data = data
+            value = self._raw_value = [value, None, None]
+        return value
+
+    @value.setter
+    def value(self, value):
+        self._raw_value = value
+
+    @property
+    def items(self):
+        items = self._items
+        if items is _NO_ITEMS:  # 未添加过选项
+            items = self._items = []
+        return items
+
+    @items.setter
+    def items(self, value):
+        if isinstance(value, ItemProvider):
+            value.parent = self
+        self._items = value
+        self._selectable = None
+
+    @property
+    def skip(self) -> bool:
+        return self._skip
+
+    @skip.setter
+    def skip(self, value: bool):
+        self._skip = value
+        parent = self.parent
+        if parent is not None:  # 使所属菜单的可选索引表失效
+            parent._selectable = None
+
+    def selectable(self):
+        """
+        返回可被选中（未设为跳过）的选项索引，按升序排列
+        表在 add()，clear_items()，重新赋值 items，选项数量变化 或 选项 (parent 为本菜单) 的 skip 被修改后重新生成
+
+        Returns:
+            array
+            None: items 为 ItemProvider，不生成索引表
+
+        Notes:
+            直接替换列表中的选项 (items[i] = ...)，或修改未通过 add() 添加的选项的 skip 后，
+            需要重新赋值 items (menu.items = menu.items) 使索引表失效
+        """
+        items = self.items
+        if isinstance(items, ItemProvider):
+            return None
+        n = len(items)
+        table = self._selectable
+        if table is None or self._selectable_key != n:
+            table = array('H' if n <= 0xFFFF else 'I')
+            for i in range(n):
+                if not items[i].skip:
+                    table.append(i)
+            self._selectable = table
+            self._selectable_key = n
+        return table
 
     def add(self, item, parent=None):
         """
@@ -576,19 +1138,24 @@ class MenuItem:
             item: MenuItem, BackItem, ValueItem 或 ToggleItem 实例 或 包含上述内容的列表
             parent: 父菜单实例
         """
+        if isinstance(self.items, ItemProvider):
+            raise TypeError('[ERROR] MenuItem: Cannot add items to a menu using an ItemProvider')
         if isinstance(item, list) or isinstance(item, tuple):
             for i in item:
                 self.add(i, parent)
         else:
             item.parent = parent if parent else self
             self.items.append(item)
+            self._selectable = None
 
-    def clear(self):
+    def clear_items(self):
         """清除所有条目"""
         self.items = []
 
 
 class BackItem(MenuItem):
+    __slots__ = ()
+
     def __init__(self, name='', img='', callback=None):
         """
         返回菜单项
@@ -602,6 +1169,8 @@ class BackItem(MenuItem):
 
 
 class ValueItem(MenuItem):
+    __slots__ = ()
+
     def __init__(self, name='', value='', img='', skip: bool = False, callback=None, data=None):
         """
         值显示选项
@@ -618,6 +1187,8 @@ class ValueItem(MenuItem):
 
 
 class ToggleItem(ValueItem):
+    __slots__ = ('value_t', 'value_f', 'img_t', 'img_f', 'status_callback', 'change_callback')
+
     def __init__(self, name, status_callback, change_callback=None, value_t='[*]', value_f='[ ]', img_t='', img_f='',
                  skip: bool = False, data=None):
         """
@@ -659,3 +1230,324 @@ class ToggleItem(ValueItem):
 
     def _get_status(self):
         return self.status_callback()
+
+
+def _ilistdir(path: str):
+    """
+    逐个返回目录中的 (名称, 是否为目录)，不会一次性读取整个目录
+
+    Args:
+        path: 目录路径
+    """
+    ilistdir = getattr(os, 'ilistdir', None)
+    if ilistdir:
+        for entry in ilistdir(path):
+            yield entry[0], entry[1] == 0x4000
+    else:  # CPython
+        for entry in os.scandir(path):
+            yield entry.name, entry.is_dir()
+
+
+def _abspath(path: str) -> str:
+    """
+    返回不含 "." 和 ".." 的绝对路径
+
+    Args:
+        path: 路径
+    """
+    if not path.startswith('/'):
+        path = os.getcwd().rstrip('/') + '/' + path
+    parts = []
+    for part in path.split('/'):
+        if part == '..':
+            if parts:
+                parts.pop()
+        elif part and part != '.':
+            parts.append(part)
+    return '/' + '/'.join(parts)
+
+
+def _fnv1a(text: str) -> int:
+    """
+    32 位 FNV-1a 哈希，与 hash() 不同，每次运行的结果都相同
+
+    Args:
+        text: 字符串
+    """
+    h = 0x811C9DC5
+    for b in text.encode():
+        h = ((h ^ b) * 0x01000193) & 0xFFFFFFFF
+    return h
+
+
+class DirItems(ItemProvider):
+    _index_owner = OrderedDict()  # 索引文件: 最后写入该文件的 DirItems，按使用顺序排列
+    _MAX_INDEXES = 4  # 保留的索引文件数量，超出时删除最久未使用的索引文件
+
+    def __init__(self, path: str = '/', sort: bool = False, item_factory=None, index: str = '/.easymenu/idx',
+                 window: int = 16, chunk: int = 64):
+        """
+        按需列出目录内容的 ItemProvider，只为当前页面附近的文件创建选项
+
+        Args:
+            path: 目录路径
+            sort: 排序：目录在前，按名称排序，需要写入索引文件
+            item_factory: 创建选项的函数 item_factory(name, path, is_dir)，默认为目录创建 DirItem，为文件创建 ValueItem
+            index: 索引文件路径的前缀，相对路径基于当前工作目录，每个目录使用 "前缀.目录路径的哈希值" 作为索引文件，
+                所在的目录不存在时自动创建，默认位于单独的目录中，使根目录也可以使用较快的归并排序
+            window: 缓存的选项数量，也是索引文件中记录位置的间隔
+            chunk: 排序时每次在内存中排序的名称数量
+        """
+        super().__init__(window)
+        self.path = path
+        self.sort = sort
+        self.item_factory = item_factory
+        self.index = index = _abspath(index)
+        self.chunk = chunk
+        self._len = None
+        self._offsets = None  # 索引文件中每 window 项的起始位置
+        self._iter = None  # 未排序时，顺序读取目录的迭代器
+        self._pos = 0  # 迭代器的下一项索引
+        abs_path = _abspath(path)
+        self._file = '{}.{:08x}'.format(index, _fnv1a(abs_path))  # 该目录的索引文件
+        self._hide = None  # 列出目录时隐藏的名称：索引文件的前缀，或包含索引文件的下级目录
+        self._in_dir = False  # 索引文件直接位于该目录中，读取目录期间不能写入
+        base = abs_path.rstrip('/') + '/'
+        if index.startswith(base):
+            name = index[len(base):]
+            self._in_dir = '/' not in name
+            self._hide = name.split('/', 1)[0]
+
+    def _join(self, name: str) -> str:
+        return self.path + name if self.path.endswith('/') else self.path + '/' + name
+
+    def _scan(self):
+        """
+        逐个返回目录中的 (名称, 是否为目录)，不包含索引文件
+        """
+        hide = self._hide
+        in_dir = self._in_dir
+        for name, is_dir in _ilistdir(self.path):
+            if hide is not None and (name == hide or in_dir and name.startswith(hide)):
+                continue
+            yield name, is_dir
+
+    def _merge(self, runs: list, out: str):
+        """
+        将多个已排序的文件合并为一个
+        """
+        files = [open(r, 'rb') for r in runs]
+        heads = [f.readline() for f in files]
+        with open(out, 'wb') as f:
+            while True:
+                j = -1
+                for i in range(len(heads)):
+                    if heads[i] and (j < 0 or heads[i] < heads[j]):
+                        j = i
+                if j < 0:
+                    break
+                f.write(heads[j])
+                heads[j] = files[j].readline()
+        for i in range(len(files)):
+            files[i].close()
+            os.remove(runs[i])
+
+    def _merge_sort(self):
+        """
+        外部归并排序：每次在内存中排序 chunk 个名称并写入临时文件，再每次合并 4 个临时文件，直到只剩一个
+        """
+        file = self._file
+        runs = []
+        lines = []
+        n = 0
+        for name, is_dir in self._scan():
+            lines.append(('0' if is_dir else '1') + name + '\n')  # 目录在前
+            if len(lines) >= self.chunk:
+                lines.sort()
+                runs.append('{}.{}'.format(file, n))
+                with open(runs[-1], 'wb') as f:
+                    for line in lines:
+                        f.write(line.encode())
+                n += 1
+                lines = []
+        lines.sort()
+        with open(file, 'wb') as f:
+            for line in lines:
+                f.write(line.encode())
+        del lines
+        if runs:
+            runs.append(file)
+            while len(runs) > 1:
+                merged = []
+                for i in range(0, len(runs), 4):
+                    group = runs[i:i + 4]
+                    if len(group) == 1:
+                        merged.append(group[0])
+                        continue
+                    merged.append('{}.{}'.format(file, n))
+                    n += 1
+                    self._merge(group, merged[-1])
+                runs = merged
+            os.rename(runs[0], file)
+
+    def _select_sort(self):
+        """
+        索引文件位于被列出的目录中时，读取目录期间不能写入文件：
+        每次完整读取一遍目录，选出比上次写入的最后一项大的 chunk 个最小名称，在读取结束后追加到索引文件
+        """
+        chunk = self.chunk
+        last = None
+        open(self._file, 'wb').close()
+        while True:
+            lines = []  # 升序排列
+            for name, is_dir in self._scan():
+                line = ('0' if is_dir else '1') + name + '\n'  # 目录在前
+                if last is not None and line <= last:
+                    continue
+                if len(lines) < chunk:
+                    lines.insert(_bisect(lines, line), line)
+                elif line < lines[-1]:
+                    lines.insert(_bisect(lines, line), line)
+                    lines.pop()
+            if not lines:
+                break
+            with open(self._file, 'ab') as f:
+                for line in lines:
+                    f.write(line.encode())
+            if len(lines) < chunk:
+                break
+            last = lines[-1]
+
+    def _build_index(self):
+        """
+        生成排序后的索引文件，并记录每 window 项的位置
+        """
+        owners = DirItems._index_owner
+        owners.pop(self._file, None)
+        while len(owners) >= DirItems._MAX_INDEXES:  # 删除最久未使用的索引文件
+            try:
+                os.remove(owners.pop(next(iter(owners)))._file)
+            except OSError:
+                pass
+        if self._in_dir:
+            self._select_sort()
+        else:
+            idx_dir = self.index.rsplit('/', 1)[0]
+            if idx_dir:
+                try:
+                    os.mkdir(idx_dir)
+                except OSError:  # 已经存在
+                    pass
+            self._merge_sort()
+        offsets = array('I')
+        count = 0
+        pos = 0
+        with open(self._file, 'rb') as f:
+            for line in f:
+                if not count % self.window:
+                    offsets.append(pos)
+                pos += len(line)
+                count += 1
+        self._offsets = offsets
+        self._len = count
+        owners[self._file] = self
+
+    def invalidate(self):
+        """
+        清空缓存，目录内容发生变化后需要调用
+        """
+        super().invalidate()
+        if DirItems._index_owner.get(self._file) is self:  # 下次读取时重新生成索引
+            DirItems._index_owner.pop(self._file)
+        self._len = None
+        self._offsets = None
+        self._iter = None
+        self._pos = 0
+
+    def __len__(self) -> int:
+        if self.sort:
+            owners = DirItems._index_owner
+            if owners.get(self._file) is self:
+                owners[self._file] = owners.pop(self._file)  # 标记为最近使用
+            else:
+                self._build_index()
+        elif self._len is None:
+            n = 0
+            for _ in self._scan():
+                n += 1
+            self._len = n
+        return self._len
+
+    def _entries(self, start: int, stop: int) -> list:
+        """
+        读取索引在 [start, stop) 范围内的 (名称, 是否为目录)
+        """
+        entries = []
+        if self.sort:
+            len(self)  # 索引文件被其他目录覆盖时重新生成
+            with open(self._file, 'rb') as f:
+                f.seek(self._offsets[start // self.window])
+                for _ in range(start % self.window):
+                    f.readline()
+                for _ in range(stop - start):
+                    line = f.readline().decode()
+                    if not line:
+                        break
+                    entries.append((line[1:-1], line[0] == '0'))
+            return entries
+        if self._iter is None or start < self._pos:  # 目录只能从头开始读取
+            self._iter = self._scan()
+            self._pos = 0
+        for entry in self._iter:
+            self._pos += 1
+            if self._pos > start:
+                entries.append(entry)
+                if self._pos >= stop:
+                    break
+        return entries
+
+    def fetch(self, start: int, stop: int) -> list:
+        factory = self.item_factory
+        items = []
+        for name, is_dir in self._entries(start, stop):
+            path = self._join(name)
+            if factory:
+                items.append(factory(name, path, is_dir))
+            elif is_dir:
+                items.append(DirItem(name, path, sort=self.sort, index=self.index, window=self.window,
+                                     chunk=self.chunk))
+            else:
+                items.append(ValueItem(name, data=path))
+        return items
+
+
+class DirItem(MenuItem):
+    __slots__ = ()
+
+    def __init__(self, name='', path: str = '/', title='', sort: bool = False, item_factory=None,
+                 index: str = '/.easymenu/idx', window: int = 16, chunk: int = 64, img='', clear: tuple = None,
+                 start: list = None, style: dict = None, layout: list = None, spacing: list = None,
+                 callback: callable = None):
+        """
+        目录菜单项，进入时才读取目录内容，被点击的文件选项的 data 为文件路径
+
+        Args:
+            name: 作为选项时：显示的名称
+            path: 目录路径
+            title: 作为菜单时：显示的标题，默认为 name
+            sort: 排序：目录在前，按名称排序
+            item_factory: 创建选项的函数 item_factory(name, path, is_dir)
+            index: 排序时使用的索引文件路径的前缀
+            window: 缓存的选项数量
+            chunk: 排序时每次在内存中排序的名称数量
+            img: 作为选项时：显示的图片
+            clear: 作为菜单时：清理屏幕的区域
+            start: 作为菜单时：选项显示起始点
+            style: 作为菜单时：菜单显示时的样式参数 和 默认的对齐设置
+            layout: 作为菜单时：(x, y) 布局
+            spacing: 作为菜单时：(x, y) 选项间隔
+            callback: 被点击时调用的函数
+        """
+        items = DirItems(path, sort=sort, item_factory=item_factory, index=index, window=window, chunk=chunk)
+        super().__init__(name=name, title=title if title else name, img=img, items=items, clear=clear, start=start,
+                         style=style, layout=layout, spacing=spacing, callback=callback, data=path)
@@ -73,6 +73,8 @@ MenuItem 父菜单设置的参数，子菜单如果不单独设置，则会继
 3. items 参数：
     传入一个包含 MenuItem, ValueItem 或者 ToggleItem 实例的列表，如果该选项下级存在选项，则该选项会作为菜单，另外也可以通过 MenuItem 实例的
     add 函数为当前菜单添加项目
+    选项数量很多时（例如日志，文件列表），可以传入 ItemProvider 子类的实例，只在显示时生成当前页面的选项，此时不能使用 add 函数
+    DirItem 是基于 os.ilistdir 的目录菜单，只在进入时读取目录，并且只为当前页面附近的文件创建选项，sort=True 时使用索引文件排序
 
 4. clear 参数：
     指定一个屏幕清理区域：(x_start, y_start, x_end, y_end)，当菜单需要更新时，会清理该区域的图像。
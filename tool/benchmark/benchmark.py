@@ -0,0 +1,321 @@
+# 在电脑上测量 EasyMenu / EasyDisplay 的性能，可以运行在 CPython 或 MicroPython unix 版本上
+# Measure the performance of EasyMenu / EasyDisplay on a computer, runs on CPython or the MicroPython unix port
+#
+# 用法 Usage:
+#   python3 tool/benchmark/benchmark.py [-n 次数] [--driver st7789_buf,st7789_spi,ssd1306_buf]
+#
+# 每项操作报告：耗时，EasyDisplay 的缓冲区分配次数，堆内存峰值，字模查找次数，文件读取次数和字节数，总线写入次数和字节数
+# Reported for each operation: wall time, EasyDisplay buffer allocations, heap peak, glyph lookups,
+# file reads and bytes, bus writes and bytes
+import gc
+import os
+import sys
+import time
+
+HERE = __file__.rsplit('/', 1)[0] if '/' in __file__ else '.'
+ROOT = HERE + '/../..'
+sys.path.insert(0, ROOT)
+sys.path.insert(0, HERE)  # 替身模块优先于系统中的同名模块
+
+# 驱动初始化时的等待与测量无关，CPython 也没有这两个函数
+time.sleep_ms = lambda ms: None
+time.sleep_us = lambda us: None
+if hasattr(time, 'ticks_us'):
+    _ticks_us = time.ticks_us
+    _ticks_diff = time.ticks_diff
+else:
+    def _ticks_us():
+        return int(time.perf_counter() * 1000000)
+
+    def _ticks_diff(a, b):
+        return a - b
+
+try:
+    import tracemalloc
+except ImportError:
+    tracemalloc = None
+
+from machine import SPI, I2C
+from driver import st7735_buf, st7735_spi, st7789_buf, st7789_spi, ssd1306_buf, sh1106_buf
+from lib import easydisplay
+from lib.easydisplay import EasyDisplay
+from lib.easymenu import EasyMenu, MenuItem, BackItem, ValueItem, ToggleItem
+
+FONT = ROOT + '/font/text_lite_16px_2312.v3.bmf'
+BMP = ROOT + '/img/test.bmp'
+PBM = ROOT + '/img/test.pbm'
+DRIVERS = ('st7789_buf', 'st7789_spi', 'st7735_buf', 'st7735_spi', 'ssd1306_buf', 'sh1106_buf')
+
+
+class _Stats:
+    def __init__(self):
+        self.reads = 0  # 读取次数
+        self.read_bytes = 0  # 读取的字节数
+        self.glyphs = 0  # 字模查找次数
+
+    def reset(self):
+        self.reads = 0
+        self.read_bytes = 0
+        self.glyphs = 0
+
+
+stats = _Stats()
+
+
+class _File:
+    def __init__(self, f):
+        """
+        记录读取次数和字节数的文件代理
+
+        Args:
+            f: 被代理的文件
+        """
+        self._f = f
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        self._f.close()
+
+    def read(self, *args):
+        data = self._f.read(*args)
+        stats.reads += 1
+        stats.read_bytes += len(data)
+        return data
+
+    def readline(self, *args):
+        data = self._f.readline(*args)
+        stats.reads += 1
+        stats.read_bytes += len(data)
+        return data
+
+    def readinto(self, buf):
+        n = self._f.readinto(buf)
+        stats.reads += 1
+        stats.read_bytes += n or 0
+        return n
+
+    def seek(self, *args):
+        return self._f.seek(*args)
+
+    def tell(self):
+        return self._f.tell()
+
+    def close(self):
+        self._f.close()
+
+
+def _open(file, mode='r'):
+    return _File(open(file, mode))
+
+
+easydisplay.open = _open  # 必须在创建 EasyDisplay 之前替换，字体文件的读取也会被记录
+
+
+def make_display(name):
+    """
+    创建屏幕和 EasyDisplay 实例
+
+    Args:
+        name: 驱动名称
+
+    Returns:
+        (屏幕, 总线, EasyDisplay)
+    """
+    if name.startswith('st77'):
+        bus = SPI(1)
+        mod = {'st7789_buf': st7789_buf, 'st7789_spi': st7789_spi,
+               'st7735_buf': st7735_buf, 'st7735_spi': st7735_spi}[name]
+        if name.startswith('st7789'):
+            dp = mod.ST7789(240, 240, bus, res=1, dc=2, cs=3)
+        else:
+            dp = mod.ST7735(128, 160, bus, res=1, dc=2, cs=3)
+        ed = EasyDisplay(dp, 'RGB565', font=FONT, show=True, color=0xFFFF, clear=True)
+    else:
+        bus = I2C(0)
+        if name == 'ssd1306_buf':
+            dp = ssd1306_buf.SSD1306_I2C(128, 64, bus)
+        else:
+            dp = sh1106_buf.SH1106_I2C(128, 64, bus)
+        ed = EasyDisplay(dp, 'MONO', font=FONT, show=True, color=1, clear=True)
+    get_glyph = ed._get_glyph
+
+    def _get_glyph(*args):
+        stats.glyphs += 1
+        return get_glyph(*args)
+
+    ed._get_glyph = _get_glyph
+    return dp, bus, ed
+
+
+def make_menu(width, height):
+    """
+    创建与 main.py 相同结构的菜单
+
+    Args:
+        width: 屏幕宽度
+        height: 屏幕高度
+    """
+    menu = MenuItem(title=('Menu', 'c', 0), layout=[1, max(1, height // 16 - 2)], spacing=[width, 16])
+    menu1 = MenuItem('Menu-1')
+    menu1.add(ValueItem('Time: ', '123'))
+    menu1.add(ValueItem(('TEST', 'c', 'c')))
+    menu1.add(ToggleItem('Select:', lambda: True, lambda: None, value_t='[*]', value_f='[ ]'))
+    menu1.add(BackItem('Back'))
+    menu.add(menu1)
+    menu.add(MenuItem('Menu-2'))
+    menu.add(MenuItem(('Menu-3', 5, 0)))
+    menu.add(ValueItem('Status:', 'OK'))
+    menu.add(ValueItem('IP:', (lambda: '0.0.0.0', 'r', 'c'), skip=True))
+    for i in range(4, 10):
+        menu.add(MenuItem('Menu-%d' % i))
+    return menu
+
+
+def make_dat(path, width, height):
+    """
+    生成一个 dat 测试图片
+
+    Args:
+        path: 文件路径
+        width: 宽度
+        height: 高度
+    """
+    with open(path, 'wb') as f:
+        f.write(b'EasyDisplay\nV1\n%d %d\n' % (width, height))
+        row = bytearray(width * 2)
+        for y in range(height):
+            for x in range(width):
+                c = (x * 31 // width) << 11 | (y * 63 // height) << 5
+                row[x * 2] = c >> 8
+                row[x * 2 + 1] = c & 0xff
+            f.write(row)
+
+
+def operations(dp, ed, dat):
+    """
+    返回需要测量的操作
+
+    Args:
+        dp: 屏幕
+        ed: EasyDisplay 实例
+        dat: dat 测试图片的路径，为 None 时跳过
+
+    Returns:
+        [(名称, 准备函数, 操作函数), ...]
+    """
+    em = EasyMenu(ed, make_menu(dp.width, dp.height))
+
+    def to_root():
+        while em.menu.parent:
+            em.back(show=False)
+        em.menu.page_index = 0
+        em.menu.option_index = 0
+
+    ops = [
+        ('menu.show', None, em.show),
+        ('menu.next', None, em.next),
+        ('menu.click', to_root, em.click),
+        ('text', None, lambda: ed.text('Hello 你好 EasyDisplay', 0, 0, clear=True)),
+        ('bmp', None, lambda: ed.bmp(BMP, 0, 0)),
+        ('pbm', None, lambda: ed.pbm(PBM, 0, 0)),
+    ]
+    if dat:
+        ops.append(('dat', None, lambda: ed.dat(dat, 0, 0)))
+    return ops
+
+
+def measure(bus, ed, setup, func, n):
+    """
+    测量一项操作
+
+    Args:
+        bus: 总线
+        ed: EasyDisplay 实例
+        setup: 每次操作前调用的函数（不计入测量），可以为 None
+        func: 被测量的操作
+        n: 重复次数
+
+    Returns:
+        每次操作的平均值 (毫秒, 分配次数, 堆内存峰值, 字模查找, 读取次数, 读取字节, 写入次数, 写入字节)
+    """
+    if setup:
+        setup()
+    func()  # 预热：打开字体，填充缓存
+    total = [0] * 8
+    for _ in range(n):
+        if setup:
+            setup()
+        stats.reset()
+        bus.reset()
+        alloc = ed.alloc_count
+        gc.collect()
+        start = _ticks_us()
+        func()
+        total[0] += _ticks_diff(_ticks_us(), start)
+        total[1] += ed.alloc_count - alloc
+        total[3] += stats.glyphs
+        total[4] += stats.reads
+        total[5] += stats.read_bytes
+        total[6] += bus.writes
+        total[7] += bus.bytes
+    # 单独测量堆内存，避免影响耗时
+    if setup:
+        setup()
+    gc.collect()
+    if tracemalloc:
+        tracemalloc.start()
+        func()
+        total[2] = tracemalloc.get_traced_memory()[1] * n
+        tracemalloc.stop()
+    elif hasattr(gc, 'mem_alloc'):
+        used = gc.mem_alloc()
+        gc.disable()
+        func()
+        total[2] = (gc.mem_alloc() - used) * n
+        gc.enable()
+    return [v / n for v in total]
+
+
+def run(name, n, tmp):
+    dp, bus, ed = make_display(name)
+    dat = None
+    if ed.color_type == 'RGB565':
+        dat = tmp + '/easydisplay_benchmark.dat'
+        make_dat(dat, dp.width // 2, dp.height // 2)
+    print('%s %dx%d' % (name, dp.width, dp.height))
+    print('%-12s %9s %7s %9s %7s %7s %9s %7s %9s' % (
+        'op', 'ms', 'allocs', 'heap KB', 'glyphs', 'reads', 'read KB', 'writes', 'sent KB'))
+    for op, setup, func in operations(dp, ed, dat):
+        r = measure(bus, ed, setup, func, n)
+        print('%-12s %9.2f %7.1f %9.2f %7.1f %7.1f %9.2f %7.1f %9.2f' % (
+            op, r[0] / 1000, r[1], r[2] / 1024, r[3], r[4], r[5] / 1024, r[6], r[7] / 1024))
+    print()
+    if dat:
+        os.remove(dat)
+
+
+def main(argv):
+    n = 3
+    drivers = DRIVERS
+    tmp = os.environ.get('TMPDIR', '/tmp') if hasattr(os, 'environ') else '/tmp'
+    i = 0
+    while i < len(argv):
+        arg = argv[i]
+        if arg == '-n':
+            i += 1
+            n = int(argv[i])
+        elif arg == '--driver':
+            i += 1
+            drivers = argv[i].split(',')
+        else:
+            print('usage: benchmark.py [-n N] [--driver %s]' % ','.join(DRIVERS))
+            return
+        i += 1
+    for name in drivers:
+        run(name, n, tmp)
+
+
+if __name__ == '__main__':
+    main(sys.argv[1:])
@@ -0,0 +1,155 @@
+# 用于在 Python 上运行基准测试的 framebuf 替身，按照 MicroPython 的 framebuf 模块实现了常用的绘图方法
+# Stand-in for the MicroPython framebuf module, used to run the benchmark on Python
+# 仅用于测量，速度远低于原生实现，像素格式与原生实现保持一致
+MONO_VLSB = 0
+RGB565 = 1
+GS4_HMSB = 2
+MONO_HLSB = 3
+MONO_HMSB = 4
+GS2_HMSB = 5
+GS8 = 6
+MVLSB = MONO_VLSB
+
+
+class FrameBuffer:
+    def __init__(self, buffer, width, height, format, stride=None):
+        self._buf = memoryview(buffer)
+        self._w = width
+        self._h = height
+        self._fmt = format
+        if stride is None:
+            stride = width
+        if format in (MONO_HLSB, MONO_HMSB):
+            stride = (stride + 7) & ~7
+        self._stride = stride
+
+    def __buffer__(self, flags):
+        # 与原生实现一样支持 memoryview(fbuf)，仅适用于 Python 3.12 及以上版本
+        return memoryview(self._buf)
+
+    def _get(self, x, y):
+        b = self._buf
+        f = self._fmt
+        if f == RGB565:
+            i = (x + y * self._stride) * 2
+            return b[i] | b[i + 1] << 8
+        if f == GS8:
+            return b[x + y * self._stride]
+        if f == MONO_VLSB:
+            return b[(y >> 3) * self._stride + x] >> (y & 7) & 1
+        i = (x + y * self._stride) >> 3
+        if f == MONO_HLSB:
+            return b[i] >> (7 - (x & 7)) & 1
+        return b[i] >> (x & 7) & 1
+
+    def _set(self, x, y, c):
+        b = self._buf
+        f = self._fmt
+        if f == RGB565:
+            i = (x + y * self._stride) * 2
+            b[i] = c & 0xff
+            b[i + 1] = c >> 8 & 0xff
+            return
+        if f == GS8:
+            b[x + y * self._stride] = c & 0xff
+            return
+        if f == MONO_VLSB:
+            i = (y >> 3) * self._stride + x
+            m = 1 << (y & 7)
+        else:
+            i = (x + y * self._stride) >> 3
+            m = 1 << (7 - (x & 7)) if f == MONO_HLSB else 1 << (x & 7)
+        if c & 1:
+            b[i] |= m
+        else:
+            b[i] &= ~m & 0xff
+
+    def pixel(self, x, y, c=None):
+        if 0 <= x < self._w and 0 <= y < self._h:
+            if c is None:
+                return self._get(x, y)
+            self._set(x, y, c)
+
+    def fill_rect(self, x, y, w, h, c):
+        x0, y0 = max(x, 0), max(y, 0)
+        x1, y1 = min(x + w, self._w), min(y + h, self._h)
+        s = self._set
+        for yy in range(y0, y1):
+            for xx in range(x0, x1):
+                s(xx, yy, c)
+
+    def fill(self, c):
+        self.fill_rect(0, 0, self._w, self._h, c)
+
+    def hline(self, x, y, w, c):
+        self.fill_rect(x, y, w, 1, c)
+
+    def vline(self, x, y, h, c):
+        self.fill_rect(x, y, 1, h, c)
+
+    def rect(self, x, y, w, h, c, f=False):
+        if f:
+            return self.fill_rect(x, y, w, h, c)
+        self.hline(x, y, w, c)
+        self.hline(x, y + h - 1, w, c)
+        self.vline(x, y, h, c)
+        self.vline(x + w - 1, y, h, c)
+
+    def line(self, x1, y1, x2, y2, c):
+        dx, dy = abs(x2 - x1), -abs(y2 - y1)
+        sx, sy = (1 if x1 < x2 else -1), (1 if y1 < y2 else -1)
+        err = dx + dy
+        while True:
+            self.pixel(x1, y1, c)
+            if x1 == x2 and y1 == y2:
+                break
+            e2 = 2 * err
+            if e2 >= dy:
+                err += dy
+                x1 += sx
+            if e2 <= dx:
+                err += dx
+                y1 += sy
+
+    def ellipse(self, x, y, xr, yr, c, f=False, m=0xF):
+        # 只绘制外接矩形内满足方程的像素，用于测量已足够
+        for yy in range(-yr, yr + 1):
+            for xx in range(-xr, xr + 1):
+                d = (xx * xx) * (yr * yr) + (yy * yy) * (xr * xr)
+                if d <= (xr * xr) * (yr * yr) and (f or d >= ((xr - 1) * (xr - 1)) * (yr * yr)):
+                    self.pixel(x + xx, y + yy, c)
+
+    def poly(self, x, y, coords, c, f=False):
+        n = len(coords) // 2
+        for i in range(n):
+            j = (i + 1) % n
+            self.line(x + coords[2 * i], y + coords[2 * i + 1], x + coords[2 * j], y + coords[2 * j + 1], c)
+
+    def text(self, s, x, y, c=1):
+        # 没有内置的 8x8 字体，使用实心方块代替每个字符
+        for i in range(len(s)):
+            self.fill_rect(x + i * 8, y, 7, 7, c)
+
+    def scroll(self, xstep, ystep):
+        w, h = self._w, self._h
+        g, s = self._get, self._set
+        ys = range(h - 1, -1, -1) if ystep > 0 else range(h)
+        xs = range(w - 1, -1, -1) if xstep > 0 else range(w)
+        for yy in ys:
+            for xx in xs:
+                sx, sy = xx - xstep, yy - ystep
+                if 0 <= sx < w and 0 <= sy < h:
+                    s(xx, yy, g(sx, sy))
+
+    def blit(self, fbuf, x, y, key=-1, palette=None):
+        sw, sh = fbuf._w, fbuf._h
+        g = fbuf._get
+        s = self._set
+        pg = palette._get if palette is not None else None
+        for yy in range(max(0, -y), min(sh, self._h - y)):
+            for xx in range(max(0, -x), min(sw, self._w - x)):
+                c = g(xx, yy)
+                if pg:
+                    c = pg(c, 0)
+                if c != key:
+                    s(x + xx, y + yy, c)
@@ -0,0 +1,83 @@
+# 用于在 Python 上运行基准测试的 machine 替身，SPI / I2C 会记录写入的次数和字节数
+# Stand-in for the MicroPython machine module, SPI / I2C record the number of writes and bytes
+
+
+def _len(buf):
+    try:
+        return len(memoryview(buf))
+    except TypeError:  # Python 3.12 以下的版本中，替身 FrameBuffer 无法提供缓冲区
+        return len(buf._buf)
+
+
+class Pin:
+    IN = 0
+    OUT = 1
+    PULL_UP = 1
+    PULL_DOWN = 2
+
+    def __init__(self, id, mode=None, pull=None, value=None):
+        self.id = id
+        self._value = value or 0
+
+    def __call__(self, value=None):
+        if value is None:
+            return self._value
+        self._value = value
+
+    value = __call__
+
+    def on(self):
+        self._value = 1
+
+    def off(self):
+        self._value = 0
+
+
+class PWM:
+    def __init__(self, pin, freq=None, duty_u16=None):
+        self.pin = pin
+
+    def freq(self, value=None):
+        pass
+
+    def duty_u16(self, value=None):
+        pass
+
+    def deinit(self):
+        pass
+
+
+class SPI:
+    def __init__(self, *args, **kwargs):
+        self.writes = 0  # 写入次数
+        self.bytes = 0  # 写入的字节数
+
+    def init(self, *args, **kwargs):
+        pass
+
+    def write(self, buf):
+        self.writes += 1
+        self.bytes += _len(buf)
+
+    def reset(self):
+        self.writes = 0
+        self.bytes = 0
+
+
+class I2C:
+    def __init__(self, *args, **kwargs):
+        self.writes = 0  # 写入次数
+        self.bytes = 0  # 写入的字节数
+
+    def writeto(self, addr, buf, stop=True):
+        self.writes += 1
+        self.bytes += _len(buf)
+
+    def writevto(self, addr, vector, stop=True):
+        self.writes += 1
+        for buf in vector:
+            self.bytes += _len(buf)
+
+    def reset(self):
+        self.writes = 0
+        self.bytes = 0
@@ -0,0 +1,128 @@
+# 比较 MenuItem 新旧两种存储方式下每个选项占用的内存，可以运行在 CPython 或 MicroPython unix 版本上
+# Compare the memory used per MenuItem by the old and new layouts, runs on CPython or the MicroPython unix port
+#
+# 用法 Usage:
+#   python3 tool/benchmark/memory.py [-n 数量]
+import gc
+import sys
+
+HERE = __file__.rsplit('/', 1)[0] if '/' in __file__ else '.'
+sys.path.insert(0, HERE + '/../..')
+sys.path.insert(0, HERE)  # 替身模块优先于系统中的同名模块
+
+try:
+    import tracemalloc
+except ImportError:
+    tracemalloc = None
+
+from lib.easymenu import MenuItem, ValueItem, ToggleItem
+
+
+class LegacyItem:
+    def __init__(self, name='', title='', img='', value='', skip=False, items=None, clear=None, parent=None,
+                 start=None, style=None, layout=None, spacing=None, callback=None, data=None):
+        """
+        旧版 MenuItem 的存储方式：所有属性保存在实例字典中，name / title / img / value 总是展开为列表
+        """
+        if not isinstance(name, tuple) and not isinstance(name, list):
+            name = [name, None, None]
+        if not isinstance(title, tuple) and not isinstance(title, list):
+            title = [title, None, None]
+        if not isinstance(img, tuple) and not isinstance(img, list):
+            img = [img, None, None]
+        if not isinstance(value, tuple) and not isinstance(value, list):
+            value = [value, None, None]
+        if items is None:
+            items = []
+        self.name = name
+        self.title = title
+        self.img = img
+        self.skip = skip
+        self.value = value
+        self.items = items
+        self.clear = clear
+        self.parent = parent
+        self.start = start
+        self.style = style
+        self.layout = layout
+        self.spacing = spacing
+        self.page_index = 0
+        self.option_index = 0
+        self.callback = callback
+        self.data = data
+        self._selectable = None
+        self._selectable_key = None
+
+
+class LegacyToggleItem(LegacyItem):
+    def __init__(self, name, status_callback, change_callback=None, value_t='[*]', value_f='[ ]', img_t='', img_f=''):
+        """
+        旧版 ToggleItem 的存储方式
+        """
+        self.value_t = [value_t, None, None]
+        self.value_f = [value_f, None, None]
+        self.img_t = [img_t, None, None]
+        self.img_f = [img_f, None, None]
+        self.status_callback = status_callback
+        self.change_callback = change_callback
+        super().__init__(name=name, value=self._value, img=self._img, callback=change_callback)
+
+    def _value(self):
+        return self.value_t[0] if self.status_callback() else self.value_f[0]
+
+    def _img(self):
+        return self.img_t[0] if self.status_callback() else self.img_f[0]
+
+
+def _status():
+    return True
+
+
+CASES = (
+    ('name', lambda i: LegacyItem('Item'), lambda i: MenuItem('Item')),
+    ('name+value', lambda i: LegacyItem('Status:', value='OK'), lambda i: ValueItem('Status:', 'OK')),
+    ('aligned', lambda i: LegacyItem(('TEST', 'c', 'c')), lambda i: ValueItem(('TEST', 'c', 'c'))),
+    ('toggle', lambda i: LegacyToggleItem('Select:', _status, _status),
+     lambda i: ToggleItem('Select:', _status, _status)),
+)
+
+
+def measure(make, n: int) -> float:
+    """
+    返回创建 n 个选项时每个选项平均占用的字节数
+
+    Args:
+        make: 创建选项的函数 make(i)
+        n: 选项数量
+    """
+    gc.collect()
+    if tracemalloc:
+        tracemalloc.start()
+        items = [make(i) for i in range(n)]
+        used = tracemalloc.get_traced_memory()[0]
+        tracemalloc.stop()
+    else:
+        used = gc.mem_alloc()
+        items = [make(i) for i in range(n)]
+        used = gc.mem_alloc() - used
+    del items
+    return used / n
+
+
+def main(argv):
+    n = 300
+    if len(argv) == 2 and argv[0] == '-n':
+        n = int(argv[1])
+    elif argv:
+        print('usage: memory.py [-n N]')
+        return
+    print('bytes per item ({} items)'.format(n))
+    print('{:<12}{:>10}{:>10}{:>8}'.format('case', 'old', 'new', 'ratio'))
+    for name, old, new in CASES:
+        a = measure(old, n)
+        b = measure(new, n)
+        print('{:<12}{:>10.1f}{:>10.1f}{:>8.2f}'.format(name, a, b, b / a))
+
+
+if __name__ == '__main__':
+    main(sys.argv[1:])
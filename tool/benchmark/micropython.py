@@ -0,0 +1,14 @@
+# 用于在 Python 上运行基准测试的 micropython 替身
+# Stand-in for the MicroPython micropython module
+
+
+def const(value):
+    return value
+
+
+def native(func):
+    return func
+
+
+def viper(func):
+    return func